@@ -0,0 +1,75 @@
+"""
+Benchmarks cleaning every line of a large Tansee-style export with the
+per-line loop, the previous chain of pandas string operations, a str.translate
+table, and clean.clean_lines.
+
+Translation tables are slow for the non-ASCII characters that are replaced,
+so clean_lines instead joins the lines and replaces characters in one go.
+
+Run from the root of the repository with:
+    python -m benchmarks.cleaning
+"""
+
+
+import timeit
+
+import pandas as pd
+
+from demesstify import clean
+from demesstify.testing import messages
+
+
+TOTAL_MESSAGES = 500_000
+REPEAT = 3
+
+# Translation table equivalent to the substitutions of clean.clean_line
+TRANSLATION = str.maketrans({
+    '￼': '', '“': '"', '”': '"', '’': "'", '�': '', '…': '...',
+})
+
+
+def clean_series_chained(lines: pd.Series) -> pd.Series:
+    """Cleans a series with one pandas string operation per substitution."""
+
+    lines = lines.str.replace('￼', '', regex=False)
+    lines = lines.str.replace('“', '"', regex=False)
+    lines = lines.str.replace('”', '"', regex=False)
+    lines = lines.str.replace('’', "'", regex=False)
+    lines = lines.str.replace('�', '', regex=False)
+    lines = lines.str.replace('…', '...', regex=False)
+    return lines.str.strip()
+
+
+def clean_series_translated(lines: pd.Series) -> pd.Series:
+    """Cleans a series with a single str.translate operation."""
+    return lines.str.translate(TRANSLATION).str.strip()
+
+
+def main():
+    # Generate a large sample export, with some characters to substitute
+    text = messages.generate_sample_text(total_messages=TOTAL_MESSAGES)
+    text = text.replace(' the ', ' “the” ').replace("'", '’')
+    lines = pd.Series(text.splitlines())
+
+    # Make sure every approach produces the same result
+    expected = [clean.clean_line(line) for line in lines]
+    assert clean.clean_lines(lines).tolist() == expected
+    assert clean_series_chained(lines).tolist() == expected
+    assert clean_series_translated(lines).tolist() == expected
+
+    # Time each approach
+    timings = {
+        'Per-line loop': lambda: [clean.clean_line(line) for line in lines],
+        'Chained pandas': lambda: clean_series_chained(lines),
+        'str.translate': lambda: clean_series_translated(lines),
+        'clean_lines': lambda: clean.clean_lines(lines),
+    }
+
+    print(f'{len(lines):,} lines')
+    for name, function in timings.items():
+        seconds = min(timeit.repeat(function, number=1, repeat=REPEAT))
+        print(f'{name + ":":<16}{seconds:.3f} s')
+
+
+if __name__ == '__main__':
+    main()
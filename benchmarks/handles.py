@@ -0,0 +1,68 @@
+"""
+Benchmarks looking up messages by phone number with a LIKE join on the handle
+table against resolving the handle IDs once and filtering with IN.
+
+Run from the root of the repository with:
+    python -m benchmarks.handles
+"""
+
+
+import os
+import tempfile
+import timeit
+
+from demesstify.database import chat
+from demesstify.testing import database
+
+
+# Query that was used before handles were resolved ahead of time
+LIKE_QUERY = """
+    SELECT message.date, message.is_from_me, message.text
+    FROM message
+    INNER JOIN handle ON message.handle_id=handle.ROWID
+    WHERE handle.id LIKE ?
+    ORDER BY message.date;
+"""
+
+TOTAL_MESSAGES = 2_000_000
+TOTAL_HANDLES = 500
+TOTAL_CONTACTS = 5
+REPEAT = 3
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        # Generate a large sample database
+        path = os.path.join(directory, 'chat.db')
+        handles = database.generate_sample_database(
+            path,
+            total_messages=TOTAL_MESSAGES,
+            total_handles=TOTAL_HANDLES,
+            seed=0,
+        )
+        phones = [h[2:] for h in handles if h.startswith('+')][:TOTAL_CONTACTS]
+
+        with chat.ChatDB(path) as chatdb:
+            # Look up several contacts with a LIKE join
+            def like():
+                for phone in phones:
+                    chatdb.read_sql_query(LIKE_QUERY, params=(f'%{phone}',))
+
+            # Look up the same contacts by their resolved handle IDs
+            def resolved():
+                for phone in phones:
+                    chatdb.get_messages_from_phone(phone)
+
+            like_time = min(timeit.repeat(like, number=1, repeat=REPEAT))
+            resolved_time = min(
+                timeit.repeat(resolved, number=1, repeat=REPEAT)
+            )
+
+    print(f'{TOTAL_MESSAGES:,} messages, {TOTAL_CONTACTS} contacts')
+    print(f'LIKE join:        {like_time:.3f} s')
+    print(f'Resolved handles: {resolved_time:.3f} s')
+    print(f'Speedup:          {like_time / resolved_time:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmarks the memory used per message by the standardized dataframe with the
+standard column types against the compact column types of Parser.compact.
+
+Run from the root of the repository with:
+    python -m benchmarks.memory
+"""
+
+
+import os
+import tempfile
+
+from demesstify import parse
+from demesstify.testing import database
+
+
+TOTAL_MESSAGES = 1_000_000
+
+
+def get_bytes_per_message(messages: parse.Messages) -> float:
+    """Gets the average number of bytes used to store each message."""
+
+    data = messages.get_all()
+    return data.memory_usage(deep=True).sum() / len(data)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        # Generate a large sample database
+        path = os.path.join(directory, 'chat.db')
+        database.generate_sample_database(
+            path, total_messages=TOTAL_MESSAGES, seed=0,
+        )
+
+        # Parse the database with both the standard and compact column types
+        standard = parse.Messages.from_imessage_db(path)
+        compact = parse.Messages.from_imessage_db(path, compact=True)
+
+    print(f'{TOTAL_MESSAGES:,} messages')
+    for name, messages in [('Standard', standard), ('Compact', compact)]:
+        dtypes = ', '.join(str(dtype) for dtype in messages.get_all().dtypes)
+        bytes_per_message = get_bytes_per_message(messages)
+        print(f'{name + ":":<10}{bytes_per_message:.1f} bytes/message', end='')
+        print(f' ({dtypes})')
+
+
+if __name__ == '__main__':
+    main()
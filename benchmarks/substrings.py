@@ -0,0 +1,65 @@
+"""
+Benchmarks counting several hundred literal substrings in every message with
+one pandas str.count scan per substring against the single pass of
+Text.get_counts_of_substrings.
+
+Run from the root of the repository with:
+    python -m benchmarks.substrings
+"""
+
+
+import os
+import re
+import tempfile
+import timeit
+
+from demesstify import parse
+from demesstify.analysis.text import Text
+from demesstify.testing import database
+
+
+TOTAL_MESSAGES = 100_000
+TOTAL_SUBSTRINGS = 300
+REPEAT = 3
+
+
+def count_separately(text: Text, substrings: list[str]) -> list[int]:
+    """Counts each substring with its own scan of the messages."""
+    return [text.get_count_of_substring(term) for term in substrings]
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        # Generate a large sample database
+        path = os.path.join(directory, 'chat.db')
+        database.generate_sample_database(
+            path, total_messages=TOTAL_MESSAGES, seed=0,
+        )
+        data = parse.Messages.from_imessage_db(path).get_all()
+    text = Text(data)
+
+    # Count words, word prefixes, and pairs of words that appear in messages
+    words = sorted(set(re.findall(r'\w+', ' '.join(data['message'][:1000]))))
+    substrings = words + [word[:3] for word in words]
+    substrings += [f'{first} {second}' for first in words for second in words]
+    substrings = list(dict.fromkeys(substrings))[:TOTAL_SUBSTRINGS]
+
+    # Make sure both approaches produce the same result
+    expected = count_separately(text, substrings)
+    counts = text.get_counts_of_substrings(substrings)
+    assert counts['count'].tolist() == expected
+
+    # Time each approach
+    timings = {
+        'str.count each': lambda: count_separately(text, substrings),
+        'Single pass': lambda: text.get_counts_of_substrings(substrings),
+    }
+
+    print(f'{len(data):,} messages, {len(substrings)} substrings')
+    for name, function in timings.items():
+        seconds = min(timeit.repeat(function, number=1, repeat=REPEAT))
+        print(f'{name + ":":<16}{seconds:.3f} s')
+
+
+if __name__ == '__main__':
+    main()
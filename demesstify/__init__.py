@@ -1,2 +1,2 @@
-from . import analysis, clean, database, testing, visualize
+from . import analysis, cache, clean, database, testing, visualize
 from .parse import Messages
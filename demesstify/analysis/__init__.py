@@ -1 +1,4 @@
-from . import attachments, emojis, reactions, sentiment, text
+from . import (
+    arrays, attachments, emojis, reactions, sentiment, silences, substrings,
+    text,
+)
@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Provides array helpers that are shared by the analysis modules.
+"""
+
+
+import numpy as np
+
+
+def select_largest(values: np.ndarray, k: int) -> np.ndarray:
+    """Finds the positions of the k largest values in a one-dimensional array.
+
+    The positions are sorted from the largest value to the smallest, with ties
+    broken by position, so the earliest of any tied values are selected.
+    """
+
+    # Find the kth largest value without sorting every value
+    values = np.asarray(values)
+    if k <= 0:
+        return np.empty(0, dtype='int64')
+    if k < len(values):
+        threshold = np.partition(values, len(values) - k)[len(values) - k]
+
+        # Take every larger value, then the earliest values equal to it
+        above = np.flatnonzero(values > threshold)
+        ties = np.flatnonzero(values == threshold)[:k - len(above)]
+        positions = np.concatenate((above, ties))
+    else:
+        positions = np.arange(len(values))
+
+    # Sort the selected values by size, then by position
+    order = np.lexsort((positions, -values[positions]))
+    return positions[order]
@@ -7,14 +7,15 @@ were exchanged in a given message conversation.
 """
 
 
-from datetime import datetime, timedelta
-from typing import Optional, Union
+from datetime import datetime, timedelta, tzinfo
+from typing import Iterator, Optional, Union
 
 import pandas as pd
 
 from .. import database as db
 from .. import clean
 from ..parse import Direction
+from .silences import Silences
 
 
 class Attachment:
@@ -25,6 +26,7 @@ class Attachment:
 
         # Store instance variables
         self._data = data
+        self._silences = None
 
     def get_total(self) -> int:
         """Calculates the total number of attachments exchanged."""
@@ -79,13 +81,24 @@ class Attachment:
         # Return the number of days where attachments were not exchanged
         return len(all_dates.difference(dates_with_attachments))
 
-    def get_datetime_of_longest_silence(self) -> datetime:
+    def get_datetime_of_longest_silence(self) -> Optional[datetime]:
         """Calculates the datetime of the longest time between attachments."""
-        return self._data.index.to_series().diff().idxmax().to_pydatetime()
+        return self.get_silences().get_datetime_of_longest()
 
     def get_longest_silence(self) -> timedelta:
         """Calculates the longest time between attachments."""
-        return self._data.index.to_series().diff().max().to_pytimedelta()
+        return self.get_silences().get_longest()
+
+    def get_silences(self) -> Silences:
+        """Gets the analysis of the silences between attachments.
+        
+        The time between attachments is only computed once, and is shared by
+        every silence calculation.
+        """
+
+        if self._silences is None:
+            self._silences = Silences(self._data.index)
+        return self._silences
 
     def get_attachments_with_filetype(self, extension: str) -> pd.DataFrame:
         """Gets the attachments dataframe filtered by the specified filetype."""
@@ -113,12 +126,34 @@ class Attachments:
     def __init__(self,
             path: Optional[str]=None, handle_id: Optional[int]=None,
             phone: Optional[str]=None, email: Optional[str]=None,
+            tz: Optional[Union[str, tzinfo]]=None,
+            start: Optional[Union[str, datetime]]=None,
+            end: Optional[Union[str, datetime]]=None,
+            stream: bool=False, chunk_size: Optional[int]=None,
+            chatdb: Optional[db.chat.ChatDB]=None,
         ):
         """Initializes the Attachments object.
         
         If no path is provided, the database will be assumed to be at its
         default location.
 
+        A ChatDB instance is kept for as long as the object exists, and it is
+        reused for every query. An existing instance can be provided as chatdb
+        so that it is shared with other objects, such as Messages, in which
+        case the path is ignored. Otherwise, the instance is closed by
+        close(), or automatically when used as a context manager.
+
+        If stream is True, the query results are fetched and cleaned
+        chunk_size attachments at a time, so that memory usage does not scale
+        with the size of the database.
+
+        If a time zone is specified, the datetimes will be aware and in that
+        time zone. Otherwise, they will be naive and in local time.
+
+        If start and/or end are specified, only attachments sent within that
+        time interval are read from the database. See ChatDB.get_all_messages
+        for more information.
+
         At least one of the following parameters can be specified:
             handle_id, phone, email
         If more than one of them is provided, only the first will be used
@@ -128,15 +163,43 @@ class Attachments:
         database will be read.
         """
 
+        # Keep a connection to the database for as long as the object exists
+        owns_chatdb = chatdb is None
+        if owns_chatdb:
+            chatdb = db.chat.ChatDB(path)
+
         # Store instance variables
         self._path = path
+        self._chatdb = chatdb
+        self._owns_chatdb = owns_chatdb
         self._handle_id = handle_id
         self._phone = phone
         self._email = email
+        self._tz = tz
+        self._start, self._end = clean.to_datetime_bounds(start, end, tz=tz)
+        self._stream = stream
+        self._chunk_size = chunk_size
 
         # Load the attachments dataframe
         self._data = self._load()
 
+    def __enter__(self) -> 'Attachments':
+        """Enters the runtime context of the Attachments object."""
+        return self
+
+    def __exit__(self, *args):
+        """Closes the connections when exiting the runtime context."""
+        self.close()
+
+    def close(self):
+        """Closes the connections of the ChatDB instance it created.
+        
+        A ChatDB instance that was provided as chatdb is left open.
+        """
+
+        if self._owns_chatdb:
+            self._chatdb.close()
+
     def get(self, which: Union[str, Direction]=Direction.ALL) -> pd.DataFrame:
         """Gets the attachments dataframe."""
 
@@ -164,27 +227,67 @@ class Attachments:
         """Gets the attachments dataframe filtered by received messages."""
         return self._data[self._data['is_sender'] == 0]
 
+    def iter_chunks(self,
+            chunk_size: Optional[int]=None,
+        ) -> Iterator[pd.DataFrame]:
+        """Lazily queries the database in cleaned attachments dataframe chunks.
+        
+        Each chunk contains at most chunk_size attachments. If chunk_size is
+        not specified, the instance's chunk size is used.
+        """
+
+        # Use the instance's chunk size if one is not specified
+        if chunk_size is None:
+            chunk_size = self._chunk_size
+
+        # Query the database depending on what parameters were provided
+        options = {
+            'chunk_size': chunk_size, 'start': self._start, 'end': self._end,
+        }
+        chatdb = self._chatdb
+        if self._handle_id:
+            chunks = chatdb.iter_attachments_from_handle_id(
+                self._handle_id, **options,
+            )
+        elif self._phone:
+            chunks = chatdb.iter_attachments_from_phone(self._phone, **options)
+        elif self._email:
+            chunks = chatdb.iter_attachments_from_email(self._email, **options)
+        else:
+            chunks = chatdb.iter_all_attachments(**options)
+
+        # Clean each chunk as it is read
+        for chunk in chunks:
+            yield self._clean(chunk)
+
     def _load(self) -> pd.DataFrame:
         """Loads the attachments dataframe."""
+
+        # Combine the cleaned chunks if streaming is enabled
+        if self._stream:
+            return pd.concat(self.iter_chunks())
         
-        # Query the database depending on what parameters were provided
-        chatdb = db.chat.ChatDB(self._path)
+        # Otherwise, query the database depending on the provided parameters
+        options = {'start': self._start, 'end': self._end}
+        chatdb = self._chatdb
         if self._handle_id:
-            df = chatdb.get_attachments_from_handle_id(self._handle_id)
+            df = chatdb.get_attachments_from_handle_id(
+                self._handle_id, **options,
+            )
         elif self._phone:
-            df = chatdb.get_attachments_from_phone(self._phone)
+            df = chatdb.get_attachments_from_phone(self._phone, **options)
         elif self._email:
-            df = chatdb.get_attachments_from_email(self._email)
+            df = chatdb.get_attachments_from_email(self._email, **options)
         else:
-            df = chatdb.get_all_attachments()
+            df = chatdb.get_all_attachments(**options)
         return self._clean(df)
 
     def _clean(self, dataframe: pd.DataFrame) -> pd.DataFrame:
         """Clean the dataframe to make it more consistent with the library."""
         
         # Convert the date column to datetimes
-        dataframe['date'] = dataframe['date'].apply(
-            lambda mactime: clean.convert_mactime_to_datetime(mactime)
+        dataframe['date'] = clean.convert_mactimes_to_datetimes(
+            dataframe['date'], tz=self._tz,
         )
         
         # Rename the columns
@@ -204,4 +307,14 @@ class Attachments:
     @path.setter
     def path(self, value: Optional[str]):
         """Sets the location of the iMessage database."""
-        self._path = value
\ No newline at end of file
+
+        # Close the connections to the previous database unless shared
+        self.close()
+        self._path = value
+        self._chatdb = db.chat.ChatDB(value)
+        self._owns_chatdb = True
+
+    @property
+    def chatdb(self) -> db.chat.ChatDB:
+        """Gets the ChatDB instance used to read the iMessage database."""
+        return self._chatdb
\ No newline at end of file
@@ -7,13 +7,55 @@ given message conversation.
 """
 
 
-import collections
-from typing import Union
+import heapq
+import operator
+from typing import Iterable, Optional, Union
 
 import emoji
+import numpy as np
 import pandas as pd
 
 
+# Characters that combine emojis into larger graphemes
+ZERO_WIDTH_JOINER = '\u200d'
+EMOJI_MODIFIERS = frozenset(
+    [chr(code) for code in range(0x1F3FB, 0x1F400)] + ['\ufe0f'],
+)
+
+
+def tokenize_emojis(text: str) -> list[tuple[int, str]]:
+    """Finds every emoji in a string as (position, emoji) tuples, in order.
+
+    Skin tone modifiers and variation selectors are kept with the emoji they
+    follow, and emojis connected by zero width joiners are kept together as
+    one emoji, even if the sequence is not known to the emoji package.
+    """
+
+    tokens = []
+    end = 0
+    for match in emoji.emoji_list(text):
+        # Skip matches that were already combined into the previous emoji
+        start = match['match_start']
+        if start < end:
+            continue
+
+        # Combine the emoji with any modifiers that directly follow it
+        value = match['emoji']
+        joined = tokens and start == end + 1 and text[end] == ZERO_WIDTH_JOINER
+        end = match['match_end']
+        while end < len(text) and text[end] in EMOJI_MODIFIERS:
+            value += text[end]
+            end += 1
+
+        # Add the emoji to the last one if they are joined
+        if joined:
+            position, previous = tokens[-1]
+            tokens[-1] = (position, previous + ZERO_WIDTH_JOINER + value)
+        else:
+            tokens.append((start, value))
+    return tokens
+
+
 class Emoji:
     """Class that tracks and represents a generic Emoji.
     
@@ -22,12 +64,21 @@ class Emoji:
             The name/representation of the emoji.
     """
 
-    def __init__(self, emoji: str, data: pd.DataFrame):
-        """Initializes the Emoji object."""
+    def __init__(self,
+            emoji: str,
+            data: pd.DataFrame,
+            count: Optional[int]=None,
+        ):
+        """Initializes the Emoji object.
+        
+        If the number of occurrences of the emoji is already known, it can be
+        provided as count to avoid counting them again.
+        """
 
         # Store instance variables
         self._emoji = emoji
         self._data = data
+        self._count = count
 
     @property
     def name(self) -> str:
@@ -41,12 +92,20 @@ class Emoji:
     def get_count(self) -> int:
         """Gets the number of occurrences of the emoji."""
 
-        return self._count_emojis(self._data)
+        # Count the occurrences if they are not already known
+        if self._count is None:
+            self._count = self._count_emojis(self._data)
+        return self._count
 
     def _count_emojis(self, df: pd.DataFrame) -> int:
         """Counts the number of occurrences of the emoji in a dataframe."""
 
-        return df['message'].str.count(self.name).sum()
+        messages = df['message'].dropna()
+        return sum(
+            token == self.name
+            for message in messages
+            for _, token in tokenize_emojis(message)
+        )
     
     def __repr__(self) -> str:
         """Returns a representation of an instance of Emoji."""
@@ -73,11 +132,15 @@ class Emojis:
         # Store instance variables
         self._data = data
 
+        # Find every emoji in the messages in a single pass
+        self._occurrences = self._find_emojis(self._data['message'])
+        self._counts = {
+            emoji: len(rows) for emoji, rows in self._occurrences.items()
+        }
+
         # Initialize calculated instance variables
-        messages = '\n'.join(self._data['message'])
-        self._unique_emojis = emoji.distinct_emoji_list(messages)
+        self._unique_emojis = list(self._occurrences)
         self._emoji_objects = self._create_emoji_objects(self._unique_emojis)
-        self._counts = self._count_emojis(self._emoji_objects)
 
     @property
     def uniques(self) -> list[str]:
@@ -115,29 +178,49 @@ class Emojis:
         ) -> list[tuple[Union[str, Emoji], int]]:
         """Gets the n most frequent emojis as a list of tuples."""
 
-        counter = collections.Counter(self.get_counts())
-        most_common = counter.most_common(n)
+        most_common = heapq.nlargest(
+            n, self.get_counts().items(), key=operator.itemgetter(1),
+        )
         if return_objects:
             for e, (emoji, count) in enumerate(most_common):
                 most_common[e] = (self.get_emoji_object(emoji), count)
         return most_common
 
-    def _count_emojis(self, emoji_objects: dict[str, Emoji]):
-        """Counts the number of occurences of each unique emoji."""
-
-        counts = {}
-        for emoji_name, emoji_object in emoji_objects.items():
-            counts[emoji_name] = emoji_object.get_count()
-        return counts
-
-    def _create_emoji_objects(self, emojis: str) -> dict[str, Emoji]:
+    def _find_emojis(self, messages: Iterable[str]) -> dict[str, list[int]]:
+        """Finds the position of the message of each occurrence of each emoji.
+        
+        The emojis are ordered by their first occurrence.
+        """
+
+        # Tokenize all of the messages at once
+        messages = [
+            message if isinstance(message, str) else '' for message in messages
+        ]
+        tokens = tokenize_emojis('\n'.join(messages))
+
+        # Determine which message each emoji is in from its position
+        lengths = np.fromiter(map(len, messages), dtype='int64')
+        starts = np.cumsum(lengths + 1) - (lengths + 1)
+        positions = np.fromiter(
+            (position for position, _ in tokens), dtype='int64',
+        )
+        rows = np.searchsorted(starts, positions, side='right') - 1
+
+        # Group the messages by emoji
+        occurrences = {}
+        for row, (_, token) in zip(rows.tolist(), tokens):
+            occurrences.setdefault(token, []).append(row)
+        return occurrences
+
+    def _create_emoji_objects(self, emojis: list[str]) -> dict[str, Emoji]:
         """Gets a dictionary of emoji objects."""
 
         messages = self._data
         emoji_objects = {}
         for emoji in emojis:
-            df = messages[messages['message'].str.contains(emoji)]
-            emoji_object = Emoji(emoji, data=df)
+            rows = self._occurrences[emoji]
+            df = messages.iloc[np.unique(rows)]
+            emoji_object = Emoji(emoji, data=df, count=len(rows))
             emoji_objects[emoji] = emoji_object
         return emoji_objects
     
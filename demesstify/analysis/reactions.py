@@ -8,8 +8,9 @@ a given message conversation.
 
 
 import re
-from typing import Optional, Union
+from typing import Iterable, Optional, Union
 
+import numpy as np
 import pandas as pd
 
 from .. import errors
@@ -24,6 +25,14 @@ REACTION_NAMES = [
     'Questioned',
 ]
 
+# Every reaction message starts with one of these prefixes
+REACTION_PREFIXES = tuple(f'{name} "' for name in REACTION_NAMES)
+
+# Matches a reaction message, capturing the reaction name and quoted target
+REACTION_EXPRESSION = re.compile(
+    r'^(' + '|'.join(REACTION_NAMES) + r') "(.*)"$'
+)
+
 
 def get_reaction_names() -> list[str]:
     """Gets the list of possible reaction names."""
@@ -165,14 +174,49 @@ class Reactions:
     def get_reaction(line: str) -> Optional[str]:
         """Gets the name of the reaction if there is one."""
 
-        for name in REACTION_NAMES:
-            # Determine if the line is a reaction message
-            search = re.match(fr'^{name} \"(.*)\"$', line)
-            if search:
-                # If so, return the name of the reaction
-                return name
-        # Otherwise, return None
-        return None
+        # Ordinary messages can be rejected without running the expression
+        if not line.startswith(REACTION_PREFIXES):
+            return None
+
+        # Otherwise, return the name of the reaction if the line is one
+        match = REACTION_EXPRESSION.match(line)
+        return match.group(1) if match else None
+
+    @staticmethod
+    def get_reactions(lines: Iterable[str]) -> pd.Series:
+        """Gets the name of the reaction, if there is one, of each line."""
+        return Reactions.extract_reactions(lines)['reaction']
+
+    @staticmethod
+    def extract_reactions(lines: Iterable[str]) -> pd.DataFrame:
+        """Extracts the reaction name and target of each line in bulk.
+        
+        The target is the quoted text of the message that was reacted to.
+        Returns a dataframe with reaction and target columns, which are None
+        for lines that are not reactions.
+        """
+
+        # Convert the lines to a series if necessary
+        if not isinstance(lines, pd.Series):
+            lines = pd.Series(lines, dtype=object)
+
+        # Only run the expression on lines that start like a reaction
+        candidates = lines.str.startswith(REACTION_PREFIXES, na=False)
+        candidates = candidates.to_numpy(dtype=bool)
+
+        # Extract the reaction name and target of every candidate at once
+        names = np.full(len(lines), None, dtype=object)
+        targets = np.full(len(lines), None, dtype=object)
+        if candidates.any():
+            extracted = lines[candidates].str.extract(REACTION_EXPRESSION)
+            extracted = extracted.astype(object).where(extracted.notna(), None)
+            names[candidates] = extracted[0].to_numpy()
+            targets[candidates] = extracted[1].to_numpy()
+
+        # Return the extracted reactions, aligned with the lines
+        return pd.DataFrame(
+            {'reaction': names, 'target': targets}, index=lines.index,
+        )
 
     def _create_reaction_objects(self) -> dict[str, Reaction]:
         """Returns a dictionary of reaction objects."""
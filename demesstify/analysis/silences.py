@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Provides functionality for analyzing the silences between consecutive
+messages or attachments.
+"""
+
+
+from datetime import datetime, timedelta
+from typing import Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .arrays import select_largest
+
+
+class Silences:
+    """Analyzes the gaps between consecutive datetimes.
+
+    The gaps are computed once, as integer nanoseconds, and are shared by
+    every calculation.
+
+    Properties:
+        gaps:
+            The time between each datetime and the one before it, in
+            nanoseconds.
+    """
+
+    def __init__(self, index: pd.DatetimeIndex):
+        """Initializes the Silences object with the datetimes to analyze."""
+
+        # Store instance variables
+        self._index = pd.DatetimeIndex(index)
+
+        # Subtract each datetime from the next without creating any Timedeltas
+        self._gaps = np.diff(self._index.asi8)
+        self._gaps.flags.writeable = False
+
+    def get_longest(self) -> timedelta:
+        """Calculates the longest time between datetimes.
+
+        Returns NaT if there are fewer than two datetimes.
+        """
+
+        if len(self._gaps) == 0:
+            return pd.NaT
+        return pd.Timedelta(self._gaps.max()).to_pytimedelta()
+
+    def get_datetime_of_longest(self) -> Optional[datetime]:
+        """Calculates the datetime that ended the longest silence.
+
+        Returns None if there are fewer than two datetimes.
+        """
+
+        if len(self._gaps) == 0:
+            return None
+        return self._index[np.argmax(self._gaps) + 1].to_pydatetime()
+
+    def get_top(self, k: int=5) -> pd.DataFrame:
+        """Gets the k longest silences.
+
+        The dataframe is indexed by the datetime that ended each silence, and
+        contains the datetime that started it and its length. Silences are
+        sorted from longest to shortest, with ties broken chronologically.
+        """
+
+        # Select the longest gaps, then the earliest of any tied gaps
+        positions = select_largest(self._gaps, k)
+
+        # Look up the datetimes on either side of each gap
+        return pd.DataFrame(
+            {
+                'start': self._index[positions],
+                'silence': pd.to_timedelta(self._gaps[positions]),
+            },
+            index=self._index[positions + 1],
+        )
+
+    def get_histogram(self,
+            bins: Union[int, Sequence[Union[str, timedelta]]]=10,
+        ) -> pd.Series:
+        """Counts the silences that fall within each bin.
+
+        The bins can either be a number of equal-width bins spanning every
+        silence, or a sequence of bin edges such as ['0s', '1h', '1D'].
+        Following numpy.histogram, every bin but the last excludes its right
+        edge. The series is indexed by the interval of each bin.
+        """
+
+        # Convert bin edges to nanoseconds to compare them to the gaps
+        if not isinstance(bins, int):
+            bins = pd.to_timedelta(bins).asi8
+
+        # Count the gaps in each bin
+        counts, edges = np.histogram(self._gaps, bins=bins)
+
+        # Index the counts by their intervals
+        edges = pd.to_timedelta(np.asarray(edges).astype('int64'))
+        return pd.Series(
+            counts, index=pd.IntervalIndex.from_breaks(edges, closed='left'),
+        )
+
+    def get_percentiles(self,
+            percentiles: Sequence[float]=(25, 50, 75, 90, 99),
+        ) -> pd.Series:
+        """Calculates the length of silence at each percentile.
+
+        The percentiles should be between 0 and 100. The series is indexed by
+        percentile, and every length is NaT if there are no silences.
+        """
+
+        index = pd.Index(percentiles, name='percentile')
+        if len(self._gaps) == 0:
+            return pd.Series(pd.NaT, index=index, dtype='timedelta64[ns]')
+        values = np.percentile(self._gaps, percentiles)
+        return pd.Series(
+            pd.to_timedelta(np.round(values).astype('int64')), index=index,
+        )
+
+    @property
+    def gaps(self) -> np.ndarray:
+        """Gets the time between each datetime and the last, in nanoseconds."""
+        return self._gaps
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Provides functionality for counting the occurrences of many substrings in
+messages at once.
+"""
+
+
+import collections
+import re
+from typing import Iterable
+
+import numpy as np
+
+
+class SubstringCounter:
+    """Counts the occurrences of many literal substrings in a single pass.
+
+    The substrings are compiled into an Aho-Corasick automaton, so each
+    message is only read once no matter how many substrings are counted.
+    Consistent with str.count, the occurrences of each substring do not
+    overlap, although occurrences of different substrings may.
+
+    Properties:
+        substrings:
+            The distinct substrings that are counted, in the order they were
+            first provided.
+    """
+
+    def __init__(self, substrings: Iterable[str], ignore_case: bool=False):
+        """Initializes the SubstringCounter object.
+
+        If ignore_case is True, substrings are matched regardless of case.
+        """
+
+        # Store instance variables
+        self._substrings = list(dict.fromkeys(substrings))
+        self._ignore_case = ignore_case
+
+        # Make sure every substring can be matched
+        if not self._substrings:
+            raise ValueError('At least one substring must be provided.')
+        if '' in self._substrings:
+            raise ValueError('Substrings cannot be empty.')
+
+        # Build the automaton from the substrings as they will be matched
+        patterns = [self._normalize(term) for term in self._substrings]
+        self._transitions, self._outputs = self._build_automaton(patterns)
+
+        # Quickly rule out messages that do not contain any of the substrings
+        patterns = sorted(set(patterns), key=len, reverse=True)
+        self._expression = re.compile('|'.join(map(re.escape, patterns)))
+
+    def count(self, text: str) -> dict[int, int]:
+        """Counts the occurrences of each substring in a string.
+
+        Returns the counts keyed by the position of each substring in
+        the substrings property. Substrings that do not occur are omitted.
+        """
+
+        # Skip strings that none of the substrings occur in
+        text = self._normalize(text)
+        if not self._expression.search(text):
+            return {}
+
+        # Get local references to the automaton
+        transitions = self._transitions
+        outputs = self._outputs
+
+        # Follow the automaton through the string, one character at a time
+        counts = {}
+        ends = {}
+        state = 0
+        for position, character in enumerate(text, start=1):
+            state = transitions[state].get(character, 0)
+            if not outputs[state]:
+                continue
+
+            # Count each match that does not overlap the last of its substring
+            for term, length in outputs[state]:
+                if position - length >= ends.get(term, 0):
+                    counts[term] = counts.get(term, 0) + 1
+                    ends[term] = position
+        return counts
+
+    def count_lines(self,
+            lines: Iterable[str],
+        ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Counts the occurrences of each substring in each line.
+
+        Returns three arrays that each have an element for every line and
+        substring that occurs in it: the position of the line, the position of
+        the substring, and the number of occurrences. Lines that are not
+        strings, such as missing messages, are skipped.
+        """
+
+        rows, terms, counts = [], [], []
+        for row, line in enumerate(lines):
+            if not isinstance(line, str):
+                continue
+            for term, count in self.count(line).items():
+                rows.append(row)
+                terms.append(term)
+                counts.append(count)
+        return (
+            np.array(rows, dtype='int64'),
+            np.array(terms, dtype='int64'),
+            np.array(counts, dtype='int64'),
+        )
+
+    def _normalize(self, text: str) -> str:
+        """Converts a string to the form that the automaton matches."""
+        return text.casefold() if self._ignore_case else text
+
+    @staticmethod
+    def _build_automaton(
+            patterns: list[str],
+        ) -> tuple[list[dict[str, int]], list[tuple[tuple[int, int], ...]]]:
+        """Builds an Aho-Corasick automaton that matches the patterns.
+
+        Returns the transitions of each state, keyed by character, and the
+        patterns that end at each state, as their positions and lengths.
+        Missing transitions lead back to the initial state, which is 0.
+        """
+
+        # Add a path of states for each pattern, starting from the first state
+        transitions = [{}]
+        outputs = [[]]
+        for term, pattern in enumerate(patterns):
+            state = 0
+            for character in pattern:
+                if character not in transitions[state]:
+                    transitions.append({})
+                    outputs.append([])
+                    transitions[state][character] = len(transitions) - 1
+                state = transitions[state][character]
+            outputs[state].append((term, len(pattern)))
+
+        # Visit the states in order of depth so that shallower states are done
+        failures = [0] * len(transitions)
+        queue = collections.deque(transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            failure = failures[state]
+
+            # Fall back on the longest suffix that is also a path in the trie
+            for character, child in transitions[state].items():
+                failures[child] = transitions[failure].get(character, 0)
+                queue.append(child)
+
+            # Inherit the matches and transitions of the fallback state
+            outputs[state].extend(outputs[failure])
+            for character, child in transitions[failure].items():
+                transitions[state].setdefault(character, child)
+
+        return transitions, [tuple(output) for output in outputs]
+
+    @property
+    def substrings(self) -> list[str]:
+        """Gets the distinct substrings that are counted."""
+        return self._substrings
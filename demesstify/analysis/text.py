@@ -7,19 +7,66 @@ a given message conversation.
 """
 
 
+import re
 from datetime import datetime, timedelta
+from typing import Iterable, Optional
 
+import numpy as np
 import pandas as pd
 
+from .arrays import select_largest
+from .silences import Silences
+from .substrings import SubstringCounter
+
+
+def encode_runs(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Finds the runs of equal consecutive values in a one-dimensional array.
+
+    Returns the starting position and length of each run, in order. The value
+    of each run can be obtained by indexing values with the starting positions.
+    """
+
+    # Runs start at the beginning and wherever a value differs from the last
+    values = np.asarray(values)
+    if len(values) == 0:
+        empty = np.empty(0, dtype='int64')
+        return empty, empty.copy()
+    boundaries = np.flatnonzero(values[1:] != values[:-1]) + 1
+    starts = np.concatenate(([0], boundaries))
+
+    # Runs end where the next one starts, or at the end of the array
+    lengths = np.diff(np.append(starts, len(values)))
+    return starts, lengths
+
 
 class Text:
     """Generates useful calculations about given message data."""
 
-    def __init__(self, data: pd.DataFrame):
-        """Initializes the Messages object with message data."""
+    def __init__(self,
+            data: Optional[pd.DataFrame]=None,
+            daily_counts: Optional[pd.Series]=None,
+        ):
+        """Initializes the Messages object with message data.
+        
+        Pre-aggregated daily message counts, such as a column of
+        ChatDB.get_daily_counts, can be provided as daily_counts. They are
+        then used by the per-day calculations instead of the message data,
+        which does not need to be provided if only those are desired.
+        """
 
         # Store instance variables
         self._data = data
+        self._daily_counts = None
+        self._runs = None
+        self._silences = None
+
+        # Fill in the days that are missing from pre-aggregated counts
+        if daily_counts is not None:
+            days = pd.DatetimeIndex(daily_counts.index)
+            self._daily_counts = self._count_per_day(
+                days.values.astype('datetime64[D]'),
+                weights=daily_counts.to_numpy(),
+            )
     
     def get_total(self) -> float:
         """Calculates the total number of messages exchanged."""
@@ -31,22 +78,72 @@ class Text:
     
     def get_least_per_day(self) -> float:
         """Calculates the least number of texts exchanged in a day."""
-        grouped = self._data['message'].groupby(self._data.index.date)
-        return grouped.count().min()
+        return self._get_active_daily_counts().min()
     
     def get_most_per_day(self) -> float:
         """Calculates the greatest number of texts exchanged in a day."""
-        grouped = self._data['message'].groupby(self._data.index.date)
-        return grouped.count().max()
+        return self._get_active_daily_counts().max()
     
     def get_average_per_day(self) -> float:
         """Calculates the average number of texts exchanged in a day."""
-        grouped = self._data['message'].groupby(self._data.index.date)
-        return grouped.count().mean()
+        return self._get_active_daily_counts().mean()
     
     def get_count_of_substring(self, substring: str) -> int:
         """Calculates the number of occurrences of a substring."""
-        return self._data['message'].str.count(substring).sum()
+        return self._data['message'].str.count(re.escape(substring)).sum()
+
+    def get_counts_of_substrings(self,
+            substrings: Iterable[str],
+            by: Optional[str]=None,
+            ignore_case: bool=False,
+        ) -> pd.DataFrame:
+        """Calculates the number of occurrences of each of many substrings.
+        
+        The substrings are matched literally, and are all counted in a single
+        pass over the messages. If ignore_case is True, they are matched
+        regardless of case.
+
+        By default, the dataframe has a term and count column, with a row for
+        every distinct substring in the order they were provided. The counts
+        can instead be broken down with the by parameter:
+            'direction': by the is_sender column of each message
+            'day': by the local date of each message, as a date column
+        Breakdowns only include the rows of substrings that occur.
+        """
+
+        # Make sure the breakdown is supported
+        columns = {'direction': 'is_sender', 'day': 'date'}
+        if by is not None and by not in columns:
+            raise ValueError((
+                f"'{by}' is not a valid breakdown. Valid breakdowns are "
+                f"{', '.join(repr(option) for option in columns)}."
+            ))
+
+        # Count every substring in every message
+        counter = SubstringCounter(substrings, ignore_case=ignore_case)
+        rows, terms, counts = counter.count_lines(self._data['message'])
+        names = np.array(counter.substrings, dtype=object)
+
+        # Total the counts of each substring if no breakdown is desired
+        if by is None:
+            totals = np.bincount(
+                terms, weights=counts, minlength=len(names),
+            ).astype('int64')
+            return pd.DataFrame({'term': names, 'count': totals})
+
+        # Otherwise, look up the key of each message with a match
+        if by == 'direction':
+            keys = self._data['is_sender'].to_numpy()[rows]
+        else:
+            keys = pd.DatetimeIndex(self._get_days()[rows])
+
+        # Total the counts of each substring within each key
+        column = columns[by]
+        df = pd.DataFrame({column: keys, 'term': terms, 'count': counts})
+        df = df.groupby([column, 'term'], sort=True)['count'].sum()
+        df = df.reset_index()
+        df['term'] = names[df['term'].to_numpy()]
+        return df
     
     def get_days_since_first_message(self, ceiling: bool=True) -> int:
         """Calculates the number of days since the first message.
@@ -64,49 +161,183 @@ class Text:
     
     def get_count_of_days_with_messages(self) -> int:
         """Calculates the number of days where messages were exchanged."""
-
-        # The number of days with messages is total days minus days without
-        total_days = self.get_days_since_first_message()
-        days_without = self.get_count_of_days_without_messages()
-        return (total_days - days_without)
+        return int(np.count_nonzero(self._get_daily_counts().to_numpy()))
     
     def get_count_of_days_without_messages(self) -> int:
         """Calculates the number of days where no messages were exchanged."""
-        
-        # Get the dates of the first and last messages
-        first = self._data.first_valid_index().date()
-        last = self._data.last_valid_index().date()
-        # Find the missing dates by comparing time range to index
-        dates_with_messages = self._data.index.date
-        all_dates = pd.date_range(start=first, end=last)
-        # Return the number of days where messages were not exchanged
-        return len(all_dates.difference(dates_with_messages))
+        return int(np.sum(self._get_daily_counts().to_numpy() == 0))
     
-    def get_most_consecutive(self) -> int:
+    def get_most_consecutive(self, is_sender: Optional[bool]=None) -> int:
         """Calculates the most messages exchanged unidirectionally in a row.
         
+        If is_sender is specified, only runs of sent (True) or received
+        (False) messages are considered.
+
         This method only works when the data includes all messages, i.e.
         is not filtered by directionality.
         """
+        _, lengths = self._get_runs(is_sender)
+        return int(lengths.max()) if len(lengths) else 0
+
+    def get_run_length_distribution(self,
+            is_sender: Optional[bool]=None,
+        ) -> pd.Series:
+        """Counts the unidirectional runs of messages of each length.
+        
+        The series is indexed by run length, and only includes lengths that
+        occur. If is_sender is specified, only runs of sent (True) or received
+        (False) messages are counted.
+        """
+
+        # Count the runs of every length up to the longest
+        _, lengths = self._get_runs(is_sender)
+        counts = np.bincount(lengths)
+
+        # Only keep the lengths that occur
+        occurring = np.flatnonzero(counts)
+        return pd.Series(
+            counts[occurring], index=pd.Index(occurring, name='length'),
+        )
+
+    def get_top_runs(self,
+            k: int=5,
+            is_sender: Optional[bool]=None,
+        ) -> pd.DataFrame:
+        """Gets the k longest unidirectional runs of messages.
+        
+        The dataframe is indexed by the datetime of the first message of each
+        run, and contains the length and direction of each run. Runs are
+        sorted from longest to shortest, with ties broken chronologically.
+        If is_sender is specified, only runs of sent (True) or received
+        (False) messages are considered.
+        """
+
+        # Select the longest runs, then the earliest of any tied runs
+        starts, lengths = self._get_runs(is_sender)
+        top = select_largest(lengths, k)
+        starts, lengths = starts[top], lengths[top]
+
+        # Look up the datetime and direction of each run's first message
+        return pd.DataFrame(
+            {
+                'length': lengths,
+                'is_sender': self._data['is_sender'].to_numpy()[starts],
+            },
+            index=self._data.index[starts],
+        )
 
-        # Get a local reference to the data
-        df = self._data
-        # Shift the dataframe by one to see where directionality changes
-        direction_change = df['is_sender'].ne(df['is_sender'].shift())
-        # Cumulative sum splits into blocks because False evaluates to 0
-        blocks = direction_change.cumsum()
-        # Group each block and extract the desired columns
-        grouped = df.groupby(blocks)['is_sender']
-        # Get the counts of each group
-        counts = grouped.transform('size')
-
-        # Return the max count
-        return max(counts)
+    def get_longest_streak(self) -> int:
+        """Calculates the most consecutive days with messages exchanged."""
+
+        # Find the runs of days with and without messages
+        active = self._get_daily_counts().to_numpy() > 0
+        starts, lengths = encode_runs(active)
+
+        # Return the longest run of days with messages
+        lengths = lengths[active[starts]]
+        return int(lengths.max()) if len(lengths) else 0
     
-    def get_datetime_of_longest_silence(self) -> datetime:
+    def get_datetime_of_longest_silence(self) -> Optional[datetime]:
         """Calculates the datetime of the longest time between messages."""
-        return self._data.index.to_series().diff().idxmax().to_pydatetime()
+        return self.get_silences().get_datetime_of_longest()
 
     def get_longest_silence(self) -> timedelta:
         """Calculates the longest time between messages."""
-        return self._data.index.to_series().diff().max().to_pytimedelta()
\ No newline at end of file
+        return self.get_silences().get_longest()
+
+    def get_silences(self) -> Silences:
+        """Gets the analysis of the silences between messages.
+        
+        The time between messages is only computed once, and is shared by
+        every silence calculation.
+        """
+
+        if self._silences is None:
+            self._silences = Silences(self._data.index)
+        return self._silences
+
+    def get_daily_counts(self) -> pd.Series:
+        """Gets the number of texts exchanged on each day.
+        
+        The series is indexed by every date from the first message to the
+        last, including dates where no messages were exchanged.
+        """
+        return self._get_daily_counts().copy()
+
+    def _get_daily_counts(self) -> pd.Series:
+        """Gets the cached number of texts exchanged on each day.
+        
+        The counts are only computed once, and are shared by every per-day
+        calculation.
+        """
+
+        # Count the messages on each local day if not done already
+        if self._daily_counts is None:
+            self._daily_counts = self._count_per_day(self._get_days())
+        return self._daily_counts
+
+    def _get_active_daily_counts(self) -> pd.Series:
+        """Gets the cached daily counts of the days with messages.
+        
+        The series is empty if there are no messages, in which case its
+        reductions return NaN.
+        """
+
+        counts = self._get_daily_counts()
+        return counts[counts.to_numpy() > 0]
+
+    def _get_days(self) -> np.ndarray:
+        """Gets the local date of each message as a datetime64 array."""
+
+        index = self._data.index
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        return index.values.astype('datetime64[D]')
+
+    def _get_runs(self,
+            is_sender: Optional[bool]=None,
+        ) -> tuple[np.ndarray, np.ndarray]:
+        """Gets the starts and lengths of the unidirectional runs of messages.
+        
+        The runs are only found once, and are shared by every run calculation.
+        If is_sender is specified, only runs of sent (True) or received
+        (False) messages are returned.
+        """
+
+        # Find the runs of each direction if not done already
+        if self._runs is None:
+            directions = self._data['is_sender'].to_numpy(dtype=bool)
+            starts, lengths = encode_runs(directions)
+            self._runs = (starts, lengths, directions[starts])
+
+        # Only keep the runs of the specified direction
+        starts, lengths, directions = self._runs
+        if is_sender is None:
+            return starts, lengths
+        matches = directions == is_sender
+        return starts[matches], lengths[matches]
+
+    @staticmethod
+    def _count_per_day(
+            days: np.ndarray, weights: Optional[np.ndarray]=None,
+        ) -> pd.Series:
+        """Counts the occurrences of each day from the first to the last.
+        
+        Each day is counted once, or by its weight if weights are specified.
+        If there are no days, the series is empty.
+        """
+
+        # There is nothing to count if there are no days
+        if len(days) == 0:
+            return pd.Series(
+                np.zeros(0, dtype='int64'), index=pd.DatetimeIndex([]),
+            )
+
+        # Bin each day by its number of days after the first
+        first = days.min()
+        offsets = (days - first).astype('int64')
+        counts = np.bincount(offsets, weights=weights).astype('int64')
+
+        # Index the counts by their dates
+        dates = first + np.arange(len(counts)).astype('timedelta64[D]')
+        return pd.Series(counts, index=pd.DatetimeIndex(dates))
@@ -0,0 +1,248 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Provides functionality for caching parsed message data on disk.
+"""
+
+
+import contextlib
+import hashlib
+import json
+import os
+from typing import Any, Optional
+
+import pandas as pd
+
+from . import database as db
+
+try:
+    from pyarrow import feather
+except ImportError:
+    feather = None
+
+
+# Increment whenever the stored dataframes change to invalidate caches
+CACHE_VERSION = 2
+
+# Default location and maximum size of the cache
+DEFAULT_DIRECTORY = os.path.join(
+    os.path.expanduser('~'), '.cache', 'demesstify',
+)
+DEFAULT_MAX_SIZE = 1024**3
+
+
+def fingerprint_file(path: str, hash_contents: bool=False) -> dict[str, Any]:
+    """Gets a dictionary that identifies the current state of a file.
+
+    The fingerprint consists of the file's absolute path, size, and
+    modification time. If hash_contents is True, a hash of the file's contents
+    is included as well, which is slower but more robust.
+    """
+
+    # Identify the file by its location, size, and modification time
+    stat = os.stat(path)
+    fingerprint = {
+        'path': os.path.abspath(path),
+        'size': stat.st_size,
+        'mtime': stat.st_mtime_ns,
+    }
+
+    # Hash the contents of the file if desired
+    if hash_contents:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1024**2), b''):
+                digest.update(chunk)
+        fingerprint['hash'] = digest.hexdigest()
+
+    # Return the fingerprint
+    return fingerprint
+
+
+def fingerprint_database(
+        path: Optional[str]=None, rowid: Optional[int]=None,
+        chatdb: Optional[db.chat.ChatDB]=None,
+    ) -> dict[str, Any]:
+    """Gets a dictionary that identifies the current state of a chat.db file.
+
+    Since the database is only ever appended to, the largest message ROWID is
+    used in place of the modification time, which changes frequently. If the
+    ROWID is already known, it can be provided to avoid querying for it.
+
+    If a ChatDB instance is provided, it is used to query the database
+    instead of opening a new connection, and the path is ignored.
+    """
+
+    # Use the provided instance without closing it, or a temporary one
+    if chatdb is None:
+        context = db.chat.ChatDB(path)
+    else:
+        context = contextlib.nullcontext(chatdb)
+
+    with context as chatdb:
+        if rowid is None:
+            rowid = chatdb.get_last_rowid()
+        return {
+            'path': os.path.abspath(chatdb.db_location),
+            'rowid': rowid,
+        }
+
+
+class ParseCache:
+    """Caches standardized message dataframes on disk.
+
+    Dataframes are stored in the uncompressed Feather format if pyarrow is
+    installed, which is fast to read and write. Otherwise, they are pickled.
+    Either way, their index is stored with them, so dataframes with any
+    index, such as one by handle ID and datetime, are restored as they were.
+
+    Properties:
+        directory:
+            The directory in which the cached dataframes are stored.
+        max_size:
+            The maximum total size of the cache, in bytes. When exceeded, the
+            least recently used dataframes are evicted.
+    """
+
+    def __init__(self,
+            directory: Optional[str]=None,
+            max_size: int=DEFAULT_MAX_SIZE,
+            hash_contents: bool=False,
+        ):
+        """Initializes the ParseCache instance.
+
+        If no directory is provided, ~/.cache/demesstify will be used.
+
+        If hash_contents is True, the contents of source files are hashed
+        when fingerprinting them instead of only relying on their size and
+        modification time.
+        """
+
+        # Use the default directory if not specified
+        if directory is None:
+            directory = DEFAULT_DIRECTORY
+
+        # Store instance variables
+        self._directory = directory
+        self._max_size = max_size
+        self._hash_contents = hash_contents
+
+    def get_key(self, fingerprint: dict[str, Any], **options) -> str:
+        """Gets the cache key of a source fingerprint and parsing options."""
+
+        # Hash a canonical representation of everything that affects the data
+        identity = {
+            'version': CACHE_VERSION,
+            'fingerprint': fingerprint,
+            'options': options,
+        }
+        serialized = json.dumps(identity, sort_keys=True, default=str)
+        return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+    def fingerprint_file(self, path: str) -> dict[str, Any]:
+        """Gets the fingerprint of a source file."""
+        return fingerprint_file(path, hash_contents=self._hash_contents)
+
+    def fingerprint_database(self,
+            path: Optional[str]=None, rowid: Optional[int]=None,
+            chatdb: Optional[db.chat.ChatDB]=None,
+        ) -> dict[str, Any]:
+        """Gets the fingerprint of a chat.db file."""
+        return fingerprint_database(path, rowid=rowid, chatdb=chatdb)
+
+    def load(self, key: str) -> Optional[pd.DataFrame]:
+        """Loads the dataframe with the specified key, if it is cached."""
+
+        # Return nothing if the dataframe is not cached
+        path = self._get_path(key)
+        if not os.path.exists(path):
+            return None
+
+        # Mark the file as recently used so that it is evicted last
+        os.utime(path)
+
+        # Read the dataframe, which restores its index as well
+        if feather is not None:
+            return feather.read_feather(path)
+        return pd.read_pickle(path)
+
+    def store(self, key: str, dataframe: pd.DataFrame):
+        """Stores a dataframe with the specified key."""
+
+        # Create the cache directory if necessary
+        os.makedirs(self._directory, exist_ok=True)
+
+        # Write to a temporary file first so that partial writes are not read
+        path = self._get_path(key)
+        temporary_path = f"{path}.tmp"
+        if feather is not None:
+            feather.write_feather(
+                dataframe, temporary_path, compression='uncompressed',
+            )
+        else:
+            dataframe.to_pickle(temporary_path)
+        os.replace(temporary_path, path)
+
+        # Make sure the cache has not grown too large
+        self.evict()
+
+    def evict(self, max_size: Optional[int]=None):
+        """Removes the least recently used dataframes until under max_size.
+
+        If max_size is not specified, the cache's maximum size is used.
+        """
+
+        # Use the cache's maximum size if not specified
+        if max_size is None:
+            max_size = self._max_size
+
+        # Get the cached files, most recently used first
+        files = self._get_files()
+        files.sort(key=lambda file: file.stat().st_mtime, reverse=True)
+
+        # Remove the files that do not fit within the maximum size
+        total_size = 0
+        for file in files:
+            total_size += file.stat().st_size
+            if total_size > max_size:
+                os.remove(file.path)
+
+    def clear(self):
+        """Removes every cached dataframe."""
+        self.evict(max_size=0)
+
+    def get_size(self) -> int:
+        """Gets the total size of the cache, in bytes."""
+        return sum(file.stat().st_size for file in self._get_files())
+
+    def _get_path(self, key: str) -> str:
+        """Gets the path of the file that stores the specified key."""
+
+        extension = 'feather' if feather is not None else 'pkl'
+        return os.path.join(self._directory, f"{key}.{extension}")
+
+    def _get_files(self) -> list[os.DirEntry]:
+        """Gets the files that are stored in the cache directory."""
+
+        if not os.path.isdir(self._directory):
+            return []
+        return [
+            file for file in os.scandir(self._directory)
+            if file.is_file() and file.name.endswith(('.feather', '.pkl'))
+        ]
+
+    @property
+    def directory(self) -> str:
+        """Gets the directory in which the cached dataframes are stored."""
+        return self._directory
+
+    @property
+    def max_size(self) -> int:
+        """Gets the maximum total size of the cache, in bytes."""
+        return self._max_size
+
+    @max_size.setter
+    def max_size(self, value: int):
+        """Sets the maximum total size of the cache, in bytes."""
+        self._max_size = value
@@ -7,40 +7,111 @@ Helper functions for cleaning data.
 
 
 import re
-from datetime import datetime
+import time
+from datetime import datetime, tzinfo
+from typing import Iterable, Iterator, Optional, Union
+
+import numpy as np
+import pandas as pd
 
 from ..analysis import reactions
 
 
+# Mac Absolute Time starts at 01/01/2001, which is 31 years after 01/01/1970
+MAC_EPOCH_OFFSET = 978307200
+
+# Regular expression that matches URLs
+URL_EXPRESSION = (
+    r"\b((?:https?://|www\d{0,3}[.]|[a-z0-9.\-]+[.][a-z]{2,4}/)"
+    r"(?:[^\s()<>]+|\(([^\s()<>]+|(\([^\s()<>]+\)))*\))+(?:\(([^\s("
+    r")<>]+|(\([^\s()<>]+\)))*\)|[^\s`!()\[\]{};:'\".,<>?«»“”‘’]))"
+)
+
+# Compiled expressions that match URLs and reactions to messages with URLs
+URL_PATTERN = re.compile(URL_EXPRESSION, re.IGNORECASE)
+URL_REACTION_PATTERN = re.compile(
+    r'(' + '|'.join(reactions.get_reaction_names()) + r') "'
+    + URL_EXPRESSION + r'"',
+    re.IGNORECASE,
+)
+
+
 def remove_urls(line: str) -> str:
-    """Removes URLs from a given string."""
+    """Removes URLs from a given string.
+    
+    Reactions to messages that start with a URL are left as they are.
+    """
 
-    reacts = reactions.get_reaction_names()
-    reactions_string = '|'.join(reacts)
+    # Most lines cannot contain a URL, so avoid running the expressions
+    if not _might_contain_url(line):
+        return line
 
-    url_expression = (
-        r"(?i)\b((?:https?://|www\d{0,3}[.]|[a-z0-9.\-]+[.][a-z]{2,4}/)"
-        r"(?:[^\s()<>]+|\(([^\s()<>]+|(\([^\s()<>]+\)))*\))+(?:\(([^\s("
-        r")<>]+|(\([^\s()<>]+\)))*\)|[^\s`!()\[\]{};:'\".,<>?«»“”‘’]))"
-    )
-    url_reaction_expression = fr"({reactions_string}) \"{url_expression}\""
-    if re.match(url_reaction_expression, line):
+    # Otherwise, remove the URLs unless the line is a reaction to one
+    if URL_REACTION_PATTERN.match(line):
         return line
-    line = re.sub(url_expression, '', line)
-    return line
+    return URL_PATTERN.sub('', line)
+
+
+def remove_urls_from_lines(lines: Iterable[str]) -> pd.Series:
+    """Removes URLs from many strings at once, like remove_urls.
+    
+    The lines can be a series or any other iterable of strings. A series is
+    returned, with the same index as the lines if they were a series.
+    """
+
+    index = lines.index if isinstance(lines, pd.Series) else None
+    cleaned = [remove_urls(line) for line in lines]
+    return pd.Series(cleaned, index=index, dtype=object)
+
+
+def _might_contain_url(line: str) -> bool:
+    """Quickly checks whether a string could contain a URL.
+    
+    Every URL matched by URL_EXPRESSION contains either a slash or 'www'.
+    """
+    return '/' in line or 'www' in line.lower()
 
 
 def clean_line(line: str) -> str:
     """Performs some cleaning operations on a string/line."""
+    return _replace_characters(line).strip()
 
-    line = line.replace('￼', '')    # Remove empty space
-    line = line.replace('“', '"')   # Replace quotes
-    line = line.replace('”', '"')   # Replace quotes
-    line = line.replace('’', "'")   # Replace quotes
-    line = line.replace('�', '')    # Remove iMessage games
-    line = line.replace('…', '...') # Replace unicode ellipses
-    line = line.strip()
-    return line
+
+def clean_lines(lines: Iterable[str]) -> pd.Series:
+    """Performs the cleaning operations of clean_line on many lines at once.
+    
+    The lines can be a series or any other iterable of strings. Rather than
+    cleaning each line separately, the lines are joined so that every
+    replacement is made on all of them at once. A series is returned, with
+    the same index as the lines if they were a series.
+    """
+
+    # Get the index of the lines, if there is one
+    index = lines.index if isinstance(lines, pd.Series) else None
+    lines = list(lines)
+
+    # Join the lines using a character that none of them contain
+    text = '\0'.join(lines)
+    if lines and text.count('\0') == len(lines) - 1:
+        split = _replace_characters(text).split('\0')
+        cleaned = [line.strip() for line in split]
+    else:
+        cleaned = [clean_line(line) for line in lines]
+
+    # Return the cleaned lines
+    return pd.Series(cleaned, index=index, dtype=object)
+
+
+def _replace_characters(text: str) -> str:
+    """Replaces or removes unwanted characters in a string."""
+
+    text = text.replace('￼', '')    # Remove empty space
+    text = text.replace('“', '"')   # Replace quotes
+    text = text.replace('”', '"')   # Replace quotes
+    text = text.replace('’', "'")   # Replace quotes
+    text = text.replace('�', '')    # Remove iMessage games
+    text = text.replace('…', '...') # Replace unicode ellipses
+    return text
 
 
 def to_blocks(lines: list[str], regex: str, dead_lines: int=0):
@@ -52,13 +123,56 @@ def to_blocks(lines: list[str], regex: str, dead_lines: int=0):
     """
 
     # Determine where each block starts and ends
-    block_starts = [i for i, line in enumerate(lines) if re.match(regex, line)]
+    expression = re.compile(regex)
+    block_starts = [i for i, line in enumerate(lines) if expression.match(line)]
     block_ends = block_starts[1:] + [len(lines)]
 
     # Split into blocks and return
     return [lines[i:j-dead_lines] for i, j in zip(block_starts, block_ends)]
 
 
+def iter_blocks(
+        lines: Iterable[str], regex: str, dead_lines: int=0,
+    ) -> Iterator[list[str]]:
+    """Lazily splits an iterable of lines into sublists.
+    
+    This is the streaming counterpart of to_blocks; each block is yielded as
+    soon as the next one starts, so only a single block is held in memory.
+    Lines before the first match are discarded, just like in to_blocks.
+
+    dead_lines are the number of lines at the end of each sublist to toss away.
+    """
+
+    # Compile the expression once since it is checked against every line
+    expression = re.compile(regex)
+
+    # Accumulate lines until the start of the next block is found
+    block = None
+    for line in lines:
+        if expression.match(line):
+            if block is not None:
+                yield block[:len(block)-dead_lines]
+            block = [line]
+        elif block is not None:
+            block.append(line)
+
+    # Yield the final block
+    if block is not None:
+        yield block[:len(block)-dead_lines]
+
+
+def split_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Lazily splits lines, such as those of a file, like str.splitlines.
+    
+    Files are only read line by line at line feeds, so each line is split
+    at any other line boundaries as well, such as U+2028. This yields the
+    same lines as calling str.splitlines on the entire text.
+    """
+
+    for line in lines:
+        yield from line.splitlines() or ['']
+
+
 def convert_mactime_to_datetime(date: str) -> datetime:
     """Converts from Mac Absolute Time to a DateTime object.
     
@@ -67,5 +181,111 @@ def convert_mactime_to_datetime(date: str) -> datetime:
     """
 
     # Convert to seconds and add 31 years
-    converted = (int(date)/1e9) + 978307200
-    return datetime.fromtimestamp(converted)
\ No newline at end of file
+    converted = (int(date)/1e9) + MAC_EPOCH_OFFSET
+    return datetime.fromtimestamp(converted)
+
+
+def convert_mactimes_to_datetimes(
+        dates: Iterable[int], tz: Optional[Union[str, tzinfo]]=None,
+    ) -> pd.DatetimeIndex:
+    """Converts many Mac Absolute Times to datetimes at once.
+    
+    This is the bulk counterpart of convert_mactime_to_datetime; the
+    nanoseconds are shifted to the Unix epoch in a single NumPy operation.
+
+    If no time zone is specified, the resulting datetimes are naive and in
+    local time, just like with convert_mactime_to_datetime. Otherwise, they
+    are aware and in the specified time zone, e.g. 'UTC' or 'US/Eastern'.
+    """
+
+    # Shift the nanoseconds to the Unix epoch
+    nanoseconds = np.asarray(dates, dtype='int64') + MAC_EPOCH_OFFSET * 10**9
+
+    # Convert to the specified time zone if there is one
+    if tz is not None:
+        utc = pd.DatetimeIndex(nanoseconds.astype('datetime64[ns]'), tz='UTC')
+        return utc.tz_convert(tz)
+
+    # Otherwise, shift each timestamp by the local UTC offset at that time
+    offsets = _get_local_offsets(nanoseconds // 10**9)
+    nanoseconds = nanoseconds + offsets * 10**9
+    return pd.DatetimeIndex(nanoseconds.astype('datetime64[ns]'))
+
+
+def convert_datetime_to_mactime(date: datetime) -> int:
+    """Converts from a DateTime object to Mac Absolute Time.
+    
+    This is the inverse of convert_mactime_to_datetime. Naive datetimes are
+    assumed to be in local time.
+    """
+
+    # Get the nanoseconds since 01/01/1970, accounting for the local time zone
+    timestamp = pd.Timestamp(date)
+    if timestamp.tzinfo is None:
+        seconds = int(timestamp.floor('s').to_pydatetime().timestamp())
+        nanoseconds = seconds * 10**9 + timestamp.value % 10**9
+    else:
+        nanoseconds = timestamp.value
+
+    # Subtract 31 years
+    return nanoseconds - MAC_EPOCH_OFFSET * 10**9
+
+
+def to_datetime_bounds(
+        start: Optional[Union[str, datetime]]=None,
+        end: Optional[Union[str, datetime]]=None,
+        tz: Optional[Union[str, tzinfo]]=None,
+    ) -> tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]:
+    """Converts the start and end of a time interval to timestamps.
+    
+    Strings are interpreted in the same way as when slicing a dataframe by its
+    datetime index, so that the end of '2022-01-31' is the very last moment
+    of that day, and the end of '2022-01' is the last moment of that month.
+
+    If a time zone is specified, naive bounds are localized to it.
+    """
+
+    # Convert each bound, expanding strings to the period they represent
+    bounds = []
+    for bound, is_end in ((start, False), (end, True)):
+        if bound is None:
+            bounds.append(None)
+            continue
+        if isinstance(bound, str):
+            period = pd.Period(bound)
+            bound = period.end_time if is_end else period.start_time
+        bound = pd.Timestamp(bound)
+        if tz is not None and bound.tzinfo is None:
+            bound = bound.tz_localize(tz)
+        bounds.append(bound)
+
+    # Return the converted bounds
+    return tuple(bounds)
+
+
+def _get_local_offsets(seconds: np.ndarray) -> np.ndarray:
+    """Gets the local UTC offset, in seconds, of each Unix timestamp.
+    
+    Offsets are only looked up at the start and end of each unique day, and
+    individually for timestamps on days where the offset changes (e.g. due to
+    daylight saving time).
+    """
+
+    # Look up the offsets at the bounds of each unique day
+    unique_days, inverse = np.unique(seconds // 86400, return_inverse=True)
+    starts = np.array(
+        [time.localtime(day * 86400).tm_gmtoff for day in unique_days],
+        dtype='int64',
+    )
+    ends = np.array(
+        [time.localtime(day * 86400 + 86399).tm_gmtoff for day in unique_days],
+        dtype='int64',
+    )
+
+    # Look up the offsets individually on days where they change
+    offsets = starts[inverse]
+    changing = (starts != ends)[inverse]
+    offsets[changing] = [
+        time.localtime(second).tm_gmtoff for second in seconds[changing]
+    ]
+    return offsets
\ No newline at end of file
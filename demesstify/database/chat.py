@@ -7,22 +7,87 @@ the local iMessage database.
 """
 
 
+import contextlib
 import os
+import pathlib
+import queue
 import sqlite3
-from typing import Any, Optional
+import threading
+from datetime import datetime
+from typing import Any, Iterator, Optional, Sequence, Union
 
 import pandas as pd
 
+from .. import clean
+
+
+# The largest ROWID that SQLite can assign
+MAX_ROWID = 2**63 - 1
+
 
 class ChatDB:
     """Interacts with the local iMessage database to get messages.
+
+    Connections to the database are opened in read-only mode and kept in a
+    small thread-safe pool so that they can be reused between queries. They
+    are closed by close(), or automatically when used as a context manager:
+
+        with ChatDB(path) as chatdb:
+            messages = chatdb.get_all_messages()
+            attachments = chatdb.get_all_attachments()
+
+    An instance can also be shared by the Messages and Attachments objects
+    of the same database, so that they reuse the same connections:
+
+        with ChatDB(path) as chatdb:
+            messages = Messages.from_imessage_db(chatdb=chatdb, phone=phone)
+            attachments = Attachments(chatdb=chatdb, phone=phone)
     
     Properties:
         db_location:
             The filepath to the local iMessage database.
     """
 
-    def __init__(self, db_location: Optional[str]=None):
+    _MESSAGES_QUERY: str = """
+        SELECT message.date, message.is_from_me, message.text
+        FROM message
+    """
+    _HANDLE_MESSAGES_QUERY: str = """
+        SELECT message.handle_id, message.date, message.is_from_me,
+            message.text
+        FROM message
+    """
+    _ATTACHMENTS_QUERY: str = """
+        SELECT message.date, message.text, message.is_from_me AS is_sender,
+            attachment.filename, attachment.transfer_name
+        FROM message_attachment_join
+        INNER JOIN message
+            ON message_attachment_join.message_id=message.ROWID
+        INNER JOIN attachment
+            ON message_attachment_join.attachment_id=attachment.ROWID
+    """
+    _COUNTS_QUERY: str = """
+        SELECT {groups},
+            SUM(message.is_from_me=1) AS sent,
+            SUM(message.is_from_me=0) AS received,
+            COUNT(*) AS total
+        FROM message
+    """
+    _HANDLE_CACHE: dict[tuple[str, str], tuple[int, tuple[int, ...]]] = {}
+    _HANDLE_CACHE_LOCK = threading.Lock()
+    _CHUNK_SIZE: int = 100_000
+    _MMAP_SIZE: int = 256 * 1024**2
+    _CACHE_SIZE: int = -64 * 1024
+    _POOL_SIZE: int = 4
+
+    def __init__(self,
+            db_location: Optional[str]=None,
+            immutable: bool=False,
+            mmap_size: Optional[int]=None,
+            cache_size: Optional[int]=None,
+            query_only: bool=True,
+            pool_size: Optional[int]=None,
+        ):
         """Initializes the ChatDB instance.
         
         The chat.db file is located in: ~/Library/Messages/chat.db
@@ -34,82 +99,209 @@ class ChatDB:
         A workaround to this is to provide full disk access to your terminal,
         IDE, etc. in your system preferences. You will then be able to read the
         database without having to copy and paste it.
+
+        If immutable is True, SQLite will assume that the database cannot
+        change while it is open, which skips locking entirely. This should
+        only be used on a copy of the database.
+
+        The mmap_size (in bytes), cache_size (in pages, or in KiB if negative),
+        and query_only arguments set the SQLite pragmas of the same names on
+        each connection. At most pool_size connections are kept open at once.
         """
 
         # Use default database location if not specified
         if db_location is None:
             db_location = f"{os.path.expanduser('~')}/Library/Messages/chat.db"
-        # Store the database location as an instance variable
+        # Use default pragmas and pool size if not specified
+        if mmap_size is None:
+            mmap_size = self._MMAP_SIZE
+        if cache_size is None:
+            cache_size = self._CACHE_SIZE
+        if pool_size is None:
+            pool_size = self._POOL_SIZE
+
+        # Store instance variables
         self._db_location = db_location
-    
-    def get_all_messages(self) -> pd.DataFrame:
-        """Gets the dataframe of all messages ever exchanged."""
+        self._immutable = immutable
+        self._pragmas = {
+            'mmap_size': int(mmap_size),
+            'cache_size': int(cache_size),
+            'query_only': int(query_only),
+        }
+        self._pool_size = pool_size
+
+        # Initialize the connection pool
+        self._pool = queue.LifoQueue()
+        self._pool_lock = threading.Lock()
+        self._open_connections = 0
+
+    def __enter__(self) -> 'ChatDB':
+        """Enters the runtime context of the ChatDB instance."""
+        return self
+
+    def __exit__(self, *args):
+        """Closes the pooled connections when exiting the runtime context."""
+        self.close()
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Gets the state of the instance for pickling.
+        
+        Connections cannot be shared between processes, so they are left out
+        and the unpickled instance starts with an empty pool.
+        """
 
-        # Query the database
-        query = """
-            SELECT date, is_from_me,  text
-            FROM message
-            ORDER BY date;
+        state = self.__dict__.copy()
+        del state['_pool'], state['_pool_lock']
+        state['_open_connections'] = 0
+        return state
+
+    def __setstate__(self, state: dict[str, Any]):
+        """Restores the state of the instance with an empty pool."""
+
+        self.__dict__.update(state)
+        self._pool = queue.LifoQueue()
+        self._pool_lock = threading.Lock()
+    
+    def get_all_messages(self,
+            after_rowid: int=0, until_rowid: int=MAX_ROWID,
+            start: Optional[Union[str, datetime]]=None,
+            end: Optional[Union[str, datetime]]=None,
+        ) -> pd.DataFrame:
+        """Gets the dataframe of all messages ever exchanged.
+        
+        Only messages with a ROWID greater than after_rowid and less than or
+        equal to until_rowid are included, which allows for incrementally
+        reading messages that were added since a previous query.
+
+        Similarly, only messages sent between start and end (inclusive) are
+        included if they are specified. These are filtered by the database
+        itself, so only the necessary rows are read. Strings are interpreted
+        like they are by Messages.trim, e.g. an end of '2022-01-31' includes
+        the entirety of that day. Naive datetimes are assumed to be in local
+        time.
         """
-        return self.read_sql_query(query)
 
-    def get_messages_from_handle_id(self, handle_id: int) -> pd.DataFrame:
+        # Query the database
+        query, params = self._build_query(
+            self._MESSAGES_QUERY,
+            after_rowid=after_rowid, until_rowid=until_rowid,
+            start=start, end=end,
+        )
+        return self.read_sql_query(query, params=params)
+
+    def get_messages_from_handle_id(self,
+            handle_id: int, after_rowid: int=0, until_rowid: int=MAX_ROWID,
+            start: Optional[Union[str, datetime]]=None,
+            end: Optional[Union[str, datetime]]=None,
+        ) -> pd.DataFrame:
         """
         Gets the dataframe of all messages with a user that has the
         specified handle ID.
 
         The handle ID would come from prior knowledge or from deducing it
         by viewing the database directly.
-        """
 
-        # Query the database
-        query = """
-            SELECT date, is_from_me,  text
-            FROM message
-            WHERE handle_id=?
-            ORDER BY date;
+        For information on after_rowid, until_rowid, start, and end, see
+        get_all_messages.
         """
-        return self.read_sql_query(query, params=(handle_id,))
 
-    def get_messages_from_phone(self, phone: str) -> pd.DataFrame:
+        # Query the database
+        query, params = self._build_query(
+            self._MESSAGES_QUERY, handle_ids=[handle_id],
+            after_rowid=after_rowid, until_rowid=until_rowid,
+            start=start, end=end,
+        )
+        return self.read_sql_query(query, params=params)
+
+    def get_messages_from_phone(self,
+            phone: str, after_rowid: int=0, until_rowid: int=MAX_ROWID,
+            start: Optional[Union[str, datetime]]=None,
+            end: Optional[Union[str, datetime]]=None,
+        ) -> pd.DataFrame:
         """
         Gets the dataframe of all messages with a user that has the
         specified phone number.
-        """
 
-        # Account for the possibility of a plus sign
-        if phone[0] != "+":
-            phone = f"%{phone}"
+        For information on after_rowid, until_rowid, start, and end, see
+        get_all_messages.
+        """
 
-        # Return the resulting dataframe
-        return self._get_messages_from_id(phone)
+        # Query the database
+        query, params = self._build_query(
+            self._MESSAGES_QUERY, handle_ids=self.resolve_phone(phone),
+            after_rowid=after_rowid, until_rowid=until_rowid,
+            start=start, end=end,
+        )
+        return self.read_sql_query(query, params=params)
     
-    def get_messages_from_email(self, email: str) -> pd.DataFrame:
+    def get_messages_from_email(self,
+            email: str, after_rowid: int=0, until_rowid: int=MAX_ROWID,
+            start: Optional[Union[str, datetime]]=None,
+            end: Optional[Union[str, datetime]]=None,
+        ) -> pd.DataFrame:
         """
         Gets the dataframe of all messages with a user that has the
         specified email.
+
+        For information on after_rowid, until_rowid, start, and end, see
+        get_all_messages.
+        """
+
+        # Query the database
+        query, params = self._build_query(
+            self._MESSAGES_QUERY, handle_ids=self.resolve_email(email),
+            after_rowid=after_rowid, until_rowid=until_rowid,
+            start=start, end=end,
+        )
+        return self.read_sql_query(query, params=params)
+
+    def get_messages_from_handle_ids(self,
+            handle_ids: Optional[Sequence[int]]=None, by_handle: bool=False,
+            after_rowid: int=0, until_rowid: int=MAX_ROWID,
+            start: Optional[Union[str, datetime]]=None,
+            end: Optional[Union[str, datetime]]=None,
+        ) -> pd.DataFrame:
         """
+        Gets the dataframe of all messages with any of the specified handle
+        IDs in a single query, including the handle ID of each message.
 
-        # Return the resulting dataframe
-        return self._get_messages_from_id(email)
+        If handle_ids is not specified, messages with every handle are
+        included. If by_handle is True, the messages are ordered by handle ID
+        and then by date, which allows each conversation to be sliced out of
+        the results; otherwise, they are only ordered by date.
 
-    def get_all_attachments(self) -> pd.DataFrame:
-        """Gets the dataframe of all attachments ever exchanged."""
+        For information on after_rowid, until_rowid, start, and end, see
+        get_all_messages.
+        """
 
         # Query the database
-        query = """
-            SELECT message.date, message.text, message.is_from_me AS is_sender,
-                attachment.filename, attachment.transfer_name
-            FROM message_attachment_join
-            INNER JOIN message
-                ON message_attachment_join.message_id=message.ROWID
-            INNER JOIN attachment
-                ON message_attachment_join.attachment_id=attachment.ROWID
-            ORDER BY message.date;
+        query, params = self._build_query(
+            self._HANDLE_MESSAGES_QUERY, handle_ids=handle_ids,
+            after_rowid=after_rowid, until_rowid=until_rowid,
+            start=start, end=end, by_handle=by_handle,
+        )
+        return self.read_sql_query(query, params=params)
+
+    def get_all_attachments(self,
+            start: Optional[Union[str, datetime]]=None,
+            end: Optional[Union[str, datetime]]=None,
+        ) -> pd.DataFrame:
+        """Gets the dataframe of all attachments ever exchanged.
+        
+        For information on start and end, see get_all_messages.
         """
-        return self.read_sql_query(query)
 
-    def get_attachments_from_handle_id(self, handle_id: int) -> pd.DataFrame:
+        # Query the database
+        query, params = self._build_query(
+            self._ATTACHMENTS_QUERY, start=start, end=end,
+        )
+        return self.read_sql_query(query, params=params)
+
+    def get_attachments_from_handle_id(self,
+            handle_id: int,
+            start: Optional[Union[str, datetime]]=None,
+            end: Optional[Union[str, datetime]]=None,
+        ) -> pd.DataFrame:
         """
         Gets the dataframe of all attachments in a conversation with a user
         that has the specified handle ID.
@@ -119,87 +311,529 @@ class ChatDB:
         """
 
         # Query the database
-        query = """
-            SELECT message.date, message.text, message.is_from_me AS is_sender,
-                attachment.filename, attachment.transfer_name
-            FROM message_attachment_join
-            INNER JOIN message
-                ON message_attachment_join.message_id=message.ROWID
-            INNER JOIN attachment
-                ON message_attachment_join.attachment_id=attachment.ROWID
-            WHERE message.handle_id LIKE ?
-            ORDER BY message.date;
-        """
-        return self.read_sql_query(query, params=(handle_id,))
-
-    def get_attachments_from_phone(self, phone: str) -> pd.DataFrame:
+        query, params = self._build_query(
+            self._ATTACHMENTS_QUERY, handle_ids=[handle_id],
+            start=start, end=end,
+        )
+        return self.read_sql_query(query, params=params)
+
+    def get_attachments_from_phone(self,
+            phone: str,
+            start: Optional[Union[str, datetime]]=None,
+            end: Optional[Union[str, datetime]]=None,
+        ) -> pd.DataFrame:
         """
         Gets the dataframe of all attachments in a conversation with a user
         that has the specified phone number.
         """
 
-        # Account for the possibility of a plus sign
-        if phone[0] != "+":
-            phone = f"%{phone}"
-
-        # Return the resulting dataframe
-        return self._get_attachments_from_id(phone)
+        # Query the database
+        query, params = self._build_query(
+            self._ATTACHMENTS_QUERY, handle_ids=self.resolve_phone(phone),
+            start=start, end=end,
+        )
+        return self.read_sql_query(query, params=params)
     
-    def get_attachments_from_email(self, email: str) -> pd.DataFrame:
+    def get_attachments_from_email(self,
+            email: str,
+            start: Optional[Union[str, datetime]]=None,
+            end: Optional[Union[str, datetime]]=None,
+        ) -> pd.DataFrame:
         """
         Gets the dataframe of all attachments in a conversation with a user
         that has the specified email.
         """
 
-        # Return the resulting dataframe
-        return self._get_attachments_from_id(email)
+        # Query the database
+        query, params = self._build_query(
+            self._ATTACHMENTS_QUERY, handle_ids=self.resolve_email(email),
+            start=start, end=end,
+        )
+        return self.read_sql_query(query, params=params)
+
+    def iter_all_messages(self,
+            chunk_size: Optional[int]=None,
+            after_rowid: int=0, until_rowid: int=MAX_ROWID,
+            start: Optional[Union[str, datetime]]=None,
+            end: Optional[Union[str, datetime]]=None,
+        ) -> Iterator[pd.DataFrame]:
+        """Lazily gets all messages ever exchanged in dataframe chunks.
+        
+        This is the streaming counterpart of get_all_messages. Each chunk
+        contains at most chunk_size messages.
+        """
+
+        # Query the database
+        query, params = self._build_query(
+            self._MESSAGES_QUERY,
+            after_rowid=after_rowid, until_rowid=until_rowid,
+            start=start, end=end,
+        )
+        return self.iter_sql_query(query, params, chunk_size=chunk_size)
+
+    def iter_messages_from_handle_id(self,
+            handle_id: int, chunk_size: Optional[int]=None,
+            after_rowid: int=0, until_rowid: int=MAX_ROWID,
+            start: Optional[Union[str, datetime]]=None,
+            end: Optional[Union[str, datetime]]=None,
+        ) -> Iterator[pd.DataFrame]:
+        """
+        Lazily gets all messages with a user that has the specified handle ID
+        in dataframe chunks.
 
-    def _get_messages_from_id(self, id_: str) -> pd.DataFrame:
-        """Gets a dataframe of all messages with the specified user."""
+        This is the streaming counterpart of get_messages_from_handle_id.
+        """
+
+        # Query the database
+        query, params = self._build_query(
+            self._MESSAGES_QUERY, handle_ids=[handle_id],
+            after_rowid=after_rowid, until_rowid=until_rowid,
+            start=start, end=end,
+        )
+        return self.iter_sql_query(query, params, chunk_size=chunk_size)
+
+    def iter_messages_from_phone(self,
+            phone: str, chunk_size: Optional[int]=None,
+            after_rowid: int=0, until_rowid: int=MAX_ROWID,
+            start: Optional[Union[str, datetime]]=None,
+            end: Optional[Union[str, datetime]]=None,
+        ) -> Iterator[pd.DataFrame]:
+        """
+        Lazily gets all messages with a user that has the specified phone
+        number in dataframe chunks.
+
+        This is the streaming counterpart of get_messages_from_phone.
+        """
+
+        # Query the database
+        query, params = self._build_query(
+            self._MESSAGES_QUERY, handle_ids=self.resolve_phone(phone),
+            after_rowid=after_rowid, until_rowid=until_rowid,
+            start=start, end=end,
+        )
+        return self.iter_sql_query(query, params, chunk_size=chunk_size)
+
+    def iter_messages_from_email(self,
+            email: str, chunk_size: Optional[int]=None,
+            after_rowid: int=0, until_rowid: int=MAX_ROWID,
+            start: Optional[Union[str, datetime]]=None,
+            end: Optional[Union[str, datetime]]=None,
+        ) -> Iterator[pd.DataFrame]:
+        """
+        Lazily gets all messages with a user that has the specified email in
+        dataframe chunks.
+
+        This is the streaming counterpart of get_messages_from_email.
+        """
+
+        # Query the database
+        query, params = self._build_query(
+            self._MESSAGES_QUERY, handle_ids=self.resolve_email(email),
+            after_rowid=after_rowid, until_rowid=until_rowid,
+            start=start, end=end,
+        )
+        return self.iter_sql_query(query, params, chunk_size=chunk_size)
+
+    def iter_messages_from_handle_ids(self,
+            handle_ids: Optional[Sequence[int]]=None, by_handle: bool=False,
+            chunk_size: Optional[int]=None,
+            after_rowid: int=0, until_rowid: int=MAX_ROWID,
+            start: Optional[Union[str, datetime]]=None,
+            end: Optional[Union[str, datetime]]=None,
+        ) -> Iterator[pd.DataFrame]:
+        """
+        Lazily gets all messages with any of the specified handle IDs in
+        dataframe chunks.
+
+        This is the streaming counterpart of get_messages_from_handle_ids.
+        """
+
+        # Query the database
+        query, params = self._build_query(
+            self._HANDLE_MESSAGES_QUERY, handle_ids=handle_ids,
+            after_rowid=after_rowid, until_rowid=until_rowid,
+            start=start, end=end, by_handle=by_handle,
+        )
+        return self.iter_sql_query(query, params, chunk_size=chunk_size)
+
+    def iter_all_attachments(self,
+            chunk_size: Optional[int]=None,
+            start: Optional[Union[str, datetime]]=None,
+            end: Optional[Union[str, datetime]]=None,
+        ) -> Iterator[pd.DataFrame]:
+        """Lazily gets all attachments ever exchanged in dataframe chunks.
+        
+        This is the streaming counterpart of get_all_attachments.
+        """
+
+        # Query the database
+        query, params = self._build_query(
+            self._ATTACHMENTS_QUERY, start=start, end=end,
+        )
+        return self.iter_sql_query(query, params, chunk_size=chunk_size)
+
+    def iter_attachments_from_handle_id(self,
+            handle_id: int, chunk_size: Optional[int]=None,
+            start: Optional[Union[str, datetime]]=None,
+            end: Optional[Union[str, datetime]]=None,
+        ) -> Iterator[pd.DataFrame]:
+        """
+        Lazily gets all attachments in a conversation with a user that has
+        the specified handle ID in dataframe chunks.
+
+        This is the streaming counterpart of get_attachments_from_handle_id.
+        """
+
+        # Query the database
+        query, params = self._build_query(
+            self._ATTACHMENTS_QUERY, handle_ids=[handle_id],
+            start=start, end=end,
+        )
+        return self.iter_sql_query(query, params, chunk_size=chunk_size)
+
+    def iter_attachments_from_phone(self,
+            phone: str, chunk_size: Optional[int]=None,
+            start: Optional[Union[str, datetime]]=None,
+            end: Optional[Union[str, datetime]]=None,
+        ) -> Iterator[pd.DataFrame]:
+        """
+        Lazily gets all attachments in a conversation with a user that has
+        the specified phone number in dataframe chunks.
+
+        This is the streaming counterpart of get_attachments_from_phone.
+        """
+
+        # Query the database
+        query, params = self._build_query(
+            self._ATTACHMENTS_QUERY, handle_ids=self.resolve_phone(phone),
+            start=start, end=end,
+        )
+        return self.iter_sql_query(query, params, chunk_size=chunk_size)
+
+    def iter_attachments_from_email(self,
+            email: str, chunk_size: Optional[int]=None,
+            start: Optional[Union[str, datetime]]=None,
+            end: Optional[Union[str, datetime]]=None,
+        ) -> Iterator[pd.DataFrame]:
+        """
+        Lazily gets all attachments in a conversation with a user that has
+        the specified email in dataframe chunks.
+
+        This is the streaming counterpart of get_attachments_from_email.
+        """
+
+        # Query the database
+        query, params = self._build_query(
+            self._ATTACHMENTS_QUERY, handle_ids=self.resolve_email(email),
+            start=start, end=end,
+        )
+        return self.iter_sql_query(query, params, chunk_size=chunk_size)
+
+    def get_daily_counts(self,
+            handle_id: Optional[int]=None,
+            phone: Optional[str]=None,
+            email: Optional[str]=None,
+            start: Optional[Union[str, datetime]]=None,
+            end: Optional[Union[str, datetime]]=None,
+            localtime: bool=True,
+        ) -> pd.DataFrame:
+        """Counts the messages that were exchanged on each day.
+
+        The messages are grouped and counted by the database itself, so only
+        one row per day is read instead of every message. The resulting
+        dataframe is indexed by date and has sent, received, and total
+        columns. Days without any messages are omitted.
+
+        Messages can be limited to a single user by specifying either their
+        handle_id, phone, or email, and to a date range by specifying start
+        and end, which behave like they do in get_all_messages. Days are in
+        local time unless localtime is False, in which case they are in UTC.
+        """
+
+        # Group the messages by the date that they were sent
+        date = self._get_date_expression(localtime)
+        counts = self._get_counts(
+            f"date({date}) AS day", 'day',
+            handle_id=handle_id, phone=phone, email=email,
+            start=start, end=end,
+        )
+        counts.index = pd.to_datetime(counts.index).rename('date')
+        return counts
+
+    def get_hourly_counts(self,
+            handle_id: Optional[int]=None,
+            phone: Optional[str]=None,
+            email: Optional[str]=None,
+            start: Optional[Union[str, datetime]]=None,
+            end: Optional[Union[str, datetime]]=None,
+            localtime: bool=True,
+        ) -> pd.DataFrame:
+        """Counts the messages that were exchanged in each hour of the week.
+
+        This is the hour-of-week counterpart of get_daily_counts. The
+        resulting dataframe is indexed by weekday, where 0 is Sunday, and by
+        hour, from 0 to 23. Hours without any messages are omitted.
+        """
+
+        # Group the messages by the weekday and hour that they were sent
+        date = self._get_date_expression(localtime)
+        return self._get_counts(
+            ", ".join([
+                f"CAST(strftime('%w', {date}) AS INTEGER) AS weekday",
+                f"CAST(strftime('%H', {date}) AS INTEGER) AS hour",
+            ]),
+            'weekday, hour',
+            handle_id=handle_id, phone=phone, email=email,
+            start=start, end=end,
+        )
+
+    def _get_counts(self,
+            groups: str,
+            group_by: str,
+            handle_id: Optional[int]=None,
+            phone: Optional[str]=None,
+            email: Optional[str]=None,
+            start: Optional[Union[str, datetime]]=None,
+            end: Optional[Union[str, datetime]]=None,
+        ) -> pd.DataFrame:
+        """Counts the sent and received messages in each of the groups."""
+
+        # Resolve the handle IDs of the user, if one was specified
+        handle_ids = None
+        if handle_id is not None:
+            handle_ids = [handle_id]
+        elif phone is not None:
+            handle_ids = self.resolve_phone(phone)
+        elif email is not None:
+            handle_ids = self.resolve_email(email)
+
+        # Query the database and index the counts by their groups
+        query, params = self._build_query(
+            self._COUNTS_QUERY.format(groups=groups), handle_ids=handle_ids,
+            start=start, end=end, group_by=group_by,
+        )
+        counts = self.read_sql_query(query, params=params)
+        return counts.set_index(group_by.split(', '))
+
+    def _get_date_expression(self, localtime: bool=True) -> str:
+        """Gets the SQL expression that converts message dates to datetimes.
+
+        The expression consists of the arguments of SQLite's date and time
+        functions, which convert Mac Absolute Time to local time or UTC.
+        """
+
+        # Convert from nanoseconds since 2001 to seconds since 1970
+        seconds = f"message.date / 1000000000 + {clean.MAC_EPOCH_OFFSET}"
+        modifiers = "'unixepoch', 'localtime'" if localtime else "'unixepoch'"
+        return f"{seconds}, {modifiers}"
+
+    def _build_query(self,
+            select: str,
+            handle_ids: Optional[Sequence[int]]=None,
+            after_rowid: int=0,
+            until_rowid: int=MAX_ROWID,
+            start: Optional[Union[str, datetime]]=None,
+            end: Optional[Union[str, datetime]]=None,
+            group_by: Optional[str]=None,
+            by_handle: bool=False,
+        ) -> tuple[str, tuple[Any, ...]]:
+        """Builds a query and its parameters from a SELECT statement.
+        
+        The statement is filtered by the given handle IDs, message ROWID
+        bounds, and datetime bounds, and ordered by message date, or by
+        handle ID and then message date if by_handle is True. If group_by is
+        specified, the rows are grouped and ordered by it instead.
+        """
+
+        # Filter the messages
+        conditions, params = [], []
+        if handle_ids is not None:
+            placeholders = ', '.join('?' * len(handle_ids))
+            conditions.append(f"message.handle_id IN ({placeholders})")
+            params.extend(handle_ids)
+        conditions.append("message.ROWID>? AND message.ROWID<=?")
+        params.extend([after_rowid, until_rowid])
+
+        # Filter the messages by date using Mac Absolute Time
+        start, end = clean.to_datetime_bounds(start, end)
+        if start is not None:
+            conditions.append("message.date>=?")
+            params.append(clean.convert_datetime_to_mactime(start))
+        if end is not None:
+            conditions.append("message.date<=?")
+            params.append(clean.convert_datetime_to_mactime(end))
+
+        # Group the messages if desired
+        if group_by is None and by_handle:
+            ordering = ["ORDER BY message.handle_id, message.date;"]
+        elif group_by is None:
+            ordering = ["ORDER BY message.date;"]
+        else:
+            ordering = [f"GROUP BY {group_by}", f"ORDER BY {group_by};"]
+
+        # Construct and return the query and its parameters
+        query = "\n".join([
+            select,
+            f"WHERE {' AND '.join(conditions)}",
+            *ordering,
+        ])
+        return query, tuple(params)
+
+    def _to_phone_pattern(self, phone: str) -> str:
+        """Converts a phone number to a handle id pattern."""
+
+        # Account for the possibility of a plus sign
+        if phone[0] != "+":
+            phone = f"%{phone}"
+        return phone
+
+    def _get_last_handle_rowid(self) -> int:
+        """Gets the ROWID of the most recently added handle."""
 
         # Query the database
         query = """
-            SELECT message.date, message.is_from_me, message.text
-            FROM message
-            INNER JOIN handle ON message.handle_id=handle.ROWID
-            WHERE handle.id LIKE ?
-            ORDER BY message.date;
+            SELECT MAX(ROWID)
+            FROM handle;
         """
-        return self.read_sql_query(query, params=(id_,))
+        with self.connection() as connection:
+            rowid = connection.execute(query).fetchone()[0]
+        return 0 if rowid is None else rowid
 
-    def _get_attachments_from_id(self, id_: str) -> pd.DataFrame:
-        """"""
+    def resolve_phone(self, phone: str) -> tuple[int, ...]:
+        """Gets the handle IDs of a user that has the specified phone number."""
+        return self.resolve_handles(self._to_phone_pattern(phone))
+
+    def resolve_email(self, email: str) -> tuple[int, ...]:
+        """Gets the handle IDs of a user that has the specified email."""
+        return self.resolve_handles(email)
+
+    def resolve_handles(self, pattern: str) -> tuple[int, ...]:
+        """Gets the handle IDs whose id matches the specified LIKE pattern.
+        
+        Resolving handles once lets messages and attachments be looked up by
+        their indexed handle ID instead of scanning every message. Results are
+        cached per database and reused until a new handle is added.
+        """
+
+        # Use the cached handle IDs if no handles were added since
+        last_handle = self._get_last_handle_rowid()
+        key = (os.path.abspath(self.db_location), pattern)
+        with self._HANDLE_CACHE_LOCK:
+            cached = self._HANDLE_CACHE.get(key)
+        if cached is not None and cached[0] == last_handle:
+            return cached[1]
+
+        # Otherwise, query the database and cache the results
+        query = """
+            SELECT ROWID
+            FROM handle
+            WHERE id LIKE ?
+            ORDER BY ROWID;
+        """
+        with self.connection() as connection:
+            rows = connection.execute(query, (pattern,)).fetchall()
+        handle_ids = tuple(row[0] for row in rows)
+        with self._HANDLE_CACHE_LOCK:
+            self._HANDLE_CACHE[key] = (last_handle, handle_ids)
+        return handle_ids
+
+    def get_last_rowid(self) -> int:
+        """Gets the ROWID of the most recently added message."""
 
         # Query the database
         query = """
-            SELECT message.date, message.text, message.is_from_me AS is_sender,
-                attachment.filename, attachment.transfer_name
-            FROM message_attachment_join
-            INNER JOIN message
-                ON message_attachment_join.message_id=message.ROWID
-            INNER JOIN attachment
-                ON message_attachment_join.attachment_id=attachment.ROWID
-            INNER JOIN handle
-                ON message.handle_id=handle.ROWID
-            WHERE handle.id LIKE ?
-            ORDER BY message.date;
-        """
-        return self.read_sql_query(query, params=(id_,))
+            SELECT MAX(ROWID) AS rowid
+            FROM message;
+        """
+        rowid = self.read_sql_query(query)['rowid'].iloc[0]
+        return 0 if pd.isna(rowid) else int(rowid)
 
     def read_sql_query(self, query: str, params: Optional[Any]=None) -> pd.DataFrame:
         """Queries with database with a specified SQL command."""
 
-        # Open the connection to the database
-        connection = sqlite3.connect(self.db_location)
+        # Query the database using a pooled connection
+        with self.connection() as connection:
+            return pd.read_sql_query(query, connection, params=params)
 
-        # Query the database
-        df = pd.read_sql_query(query, connection, params=params)
+    def iter_sql_query(self,
+            query: str,
+            params: Optional[Any]=None,
+            chunk_size: Optional[int]=None,
+        ) -> Iterator[pd.DataFrame]:
+        """Lazily queries the database with a specified SQL command.
+        
+        The results are yielded in dataframes of at most chunk_size rows, so
+        that they never have to be held in memory all at once. The connection
+        is returned to the pool once the results have been exhausted.
+        """
+
+        # Use the default chunk size if not specified
+        if chunk_size is None:
+            chunk_size = self._CHUNK_SIZE
 
-        # Close the database connection
-        connection.close()
+        # Query the database using a pooled connection
+        with self.connection() as connection:
+            yield from pd.read_sql_query(
+                query, connection, params=params, chunksize=chunk_size,
+            )
 
-        # Return the dataframe
-        return df
+    @contextlib.contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrows a connection from the pool for the duration of a context.
+        
+        A new connection is opened if none are available and the pool is not
+        yet full. Otherwise, this waits for another thread to return one.
+        """
+
+        # Get an idle connection, or open a new one if there is room
+        try:
+            connection = self._pool.get_nowait()
+        except queue.Empty:
+            with self._pool_lock:
+                can_open = self._open_connections < self._pool_size
+                if can_open:
+                    self._open_connections += 1
+            if can_open:
+                try:
+                    connection = self._connect()
+                except Exception:
+                    with self._pool_lock:
+                        self._open_connections -= 1
+                    raise
+            else:
+                connection = self._pool.get()
+
+        # Lend out the connection and return it to the pool afterwards
+        try:
+            yield connection
+        finally:
+            self._pool.put(connection)
+
+    def close(self):
+        """Closes all connections that are currently in the pool."""
+
+        while True:
+            try:
+                connection = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            connection.close()
+            with self._pool_lock:
+                self._open_connections -= 1
+
+    def _connect(self) -> sqlite3.Connection:
+        """Opens a read-only connection to the database and sets pragmas."""
+
+        # Open the database through a read-only URI
+        uri = f"{pathlib.Path(self.db_location).absolute().as_uri()}?mode=ro"
+        if self._immutable:
+            uri += '&immutable=1'
+        connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+        # Tune the connection
+        for pragma, value in self._pragmas.items():
+            connection.execute(f"PRAGMA {pragma}={value};")
+        return connection
 
     @property
     def db_location(self) -> Optional[str]:
@@ -208,5 +842,9 @@ class ChatDB:
     
     @db_location.setter
     def db_location(self, value: Optional[str]):
-        """Sets the location of the iMessage database."""
+        """Sets the location of the iMessage database.
+        
+        Any pooled connections to the previous database are closed.
+        """
+        self.close()
         self._db_location = value
\ No newline at end of file
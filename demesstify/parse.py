@@ -6,20 +6,32 @@ Provides functionality for parsing and analyzing an iMessage conversation.
 """
 
 
+import contextlib
 import csv
 import re
 from abc import ABC, abstractmethod
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, tzinfo
 from enum import Enum
-from typing import Any, Optional, Union
+from typing import (
+    Any, Callable, ContextManager, Iterable, Iterator, Mapping, Optional,
+    Sequence, Union,
+)
 
+import numpy as np
 import pandas as pd
 
 from . import database as db
 from . import clean
 from .analysis import reactions
+from .cache import ParseCache
 from .testing import messages
 
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
 
 class Direction(Enum):
     """Enumeration for valid message sending directionality."""
@@ -42,11 +54,37 @@ class Parser(ABC):
     """Parses the input messages and converts into a standardized form."""
 
     _LABELS = ['datetime', 'is_sender', 'message', 'reaction']
+    _REACTION_DTYPE = pd.CategoricalDtype(reactions.REACTION_NAMES)
+    _CHUNK_SIZE: int = 100_000
+    _stream: bool = False
+    _workers: Optional[int] = None
 
     def parse(self) -> pd.DataFrame:
-        """Parses the input and outputs it in a standardized form."""
+        """Parses the input and outputs it in a standardized form.
+        
+        If streaming is enabled, the standardized chunks from iter_chunks are
+        concatenated instead of parsing the entire input at once.
+
+        Otherwise, if more than one worker is specified, the input is split
+        into partitions that are cleaned and standardized in a pool of
+        processes. The results are concatenated in their original order, so
+        they are identical to those of parsing in a single process.
+
+        On platforms that start processes by spawning them, such as macOS and
+        Windows, worker processes import the main module. Scripts that use
+        more than one worker must therefore only parse inside an
+        if __name__ == '__main__': block.
+        """
+
+        # Combine the standardized chunks if streaming is enabled
+        if self._stream:
+            return pd.concat(self.iter_chunks())
 
-        # Perform necessary operations
+        # Parse partitions of the input in parallel if enabled
+        if self._workers is not None and self._workers > 1:
+            return self._parse_in_parallel()
+
+        # Otherwise, perform necessary operations
         unclean_text = self.load()
         cleaned_text = self.clean(unclean_text)
         standardized = self.standardize(cleaned_text)
@@ -54,11 +92,62 @@ class Parser(ABC):
         # Return the fully parsed and standardized text
         return standardized
 
+    @classmethod
+    def compact(cls, dataframe: pd.DataFrame) -> pd.DataFrame:
+        """Converts a standardized dataframe to compact column types.
+        
+        Directions are stored as booleans and reactions as categories.
+        Messages are stored as Arrow-backed strings if pyarrow is installed,
+        which avoids the overhead of a Python object per message; otherwise,
+        they are left as they are.
+        """
+
+        dtypes = {'is_sender': bool, 'reaction': cls._REACTION_DTYPE}
+        if pyarrow is not None:
+            dtypes['message'] = 'string[pyarrow]'
+        return dataframe.astype(dtypes)
+
+    def parse_partition(self, partition: Any) -> pd.DataFrame:
+        """Cleans and standardizes a single partition of the input."""
+        return self.standardize(self.clean(partition))
+
+    def _parse_in_parallel(self) -> pd.DataFrame:
+        """Parses partitions of the input in a pool of processes."""
+
+        # Split the input into one partition per worker
+        partitions = self.split(self.load(), self._workers)
+        if len(partitions) < 2:
+            return self.parse_partition(partitions[0])
+
+        # Parse the partitions, keeping the results in their original order
+        with ProcessPoolExecutor(max_workers=self._workers) as executor:
+            return pd.concat(executor.map(self.parse_partition, partitions))
+
     @abstractmethod
     def get(self) -> pd.DataFrame:
         """Gets the standardized dataframe."""
         pass
 
+    @abstractmethod
+    def iter_chunks(self,
+        chunk_size: Optional[int]=None,
+    ) -> Iterator[pd.DataFrame]:
+        """Meant to lazily parse the input into standardized chunks.
+        
+        At least one chunk should be yielded, even if it is empty, so that
+        the chunks can always be concatenated.
+        """
+        pass
+
+    @abstractmethod
+    def split(self, data: Any, n: int) -> list[Any]:
+        """Meant to split the loaded input into at most n partitions.
+        
+        Each partition should be able to be parsed by parse_partition
+        independently of the others.
+        """
+        pass
+
     @abstractmethod
     def load(self) -> str:
         """Meant to load the data from the source."""
@@ -80,20 +169,92 @@ class Tansee(Parser):
 
     _BLOCK_EXPRESSION: str = r'^(From|Send To) (.*)\((.*)\) at (.*)$'
     _DATETIME_FORMAT: str = r'%b %d, %Y %H:%M:%S'
+    _HEADER_LABELS = ['direction', 'name', 'phone', 'datetime']
+    _DIRECTIONS = {'Send To': True, 'From': False}
 
-    def __init__(self, path: str):
-        """Initializes the Tansee instance."""
+    def __init__(self,
+        path: str, stream: bool=False, chunk_size: Optional[int]=None,
+        workers: Optional[int]=None,
+    ):
+        """Initializes the Tansee instance.
+        
+        If stream is True, the file is read line by line and the dataframe
+        is built chunk_size messages at a time, so that memory usage does not
+        scale with the size of the file. This is recommended for very large
+        exports.
+
+        Otherwise, if workers is greater than one, the file is split at
+        message block boundaries and the parts are parsed in that many
+        processes, which is faster for very large exports. See Parser.parse
+        for the requirements of using more than one worker.
+        """
         
         # Store instance variables
         self._path = path
+        self._stream = stream
+        self._chunk_size = chunk_size or self._CHUNK_SIZE
+        self._workers = workers
 
         # Parse the input
         self._parsed = self.parse()
-    
+
     def get(self) -> pd.DataFrame:
         """Gets the standardized dataframe."""
         return self._parsed
 
+    def iter_lines(self) -> Iterator[str]:
+        """Lazily reads the lines of the source, without line terminators.
+
+        Lines are split in the same manner as str.splitlines, so that the
+        same lines are read as when the entire file is loaded at once.
+        """
+
+        # Open the text file and read it one line at a time
+        with open(self._path, 'r') as text_file:
+            yield from clean.split_lines(text_file)
+
+    def iter_blocks(self) -> Iterator[list[str]]:
+        """Lazily cleans the source and yields each finished message block."""
+
+        # Clean each line as it is read, in the same manner as clean()
+        cleaned = (
+            clean.clean_line(clean.remove_urls(line))
+            for line in self.iter_lines()
+        )
+
+        # Yield the message blocks as they are completed
+        yield from clean.iter_blocks(
+            cleaned, self._BLOCK_EXPRESSION, dead_lines=1,
+        )
+
+    def iter_chunks(self,
+        chunk_size: Optional[int]=None,
+    ) -> Iterator[pd.DataFrame]:
+        """Lazily parses the source into standardized dataframe chunks.
+        
+        Each chunk contains at most chunk_size messages. If chunk_size is not
+        specified, the instance's chunk size is used. A single empty chunk is
+        yielded if the source does not contain any messages.
+        """
+
+        # Use the instance's chunk size if one is not specified
+        if chunk_size is None:
+            chunk_size = self._chunk_size
+
+        # Standardize the blocks whenever enough of them have been collected
+        blocks = []
+        yielded = False
+        for block in self.iter_blocks():
+            blocks.append(block)
+            if len(blocks) >= chunk_size:
+                yield self._standardize_blocks(blocks)
+                blocks = []
+                yielded = True
+
+        # Standardize any remaining blocks, even if there are none at all
+        if blocks or not yielded:
+            yield self._standardize_blocks(blocks)
+
     def load(self) -> str:
         """Loads and returns the data from the source."""
 
@@ -104,15 +265,39 @@ class Tansee(Parser):
     def clean(self, text: str) -> list[Any]:
         """Cleans the input text and separates into lines."""
 
-        # Remove URLs from the text - done first to be more efficient
-        text = clean.remove_urls(text)
-
-        # Clean the rest of the text line-by-line
-        cleaned = [clean.clean_line(line) for line in text.splitlines()]
+        # Remove URLs from each line before cleaning the rest of the text
+        lines = clean.remove_urls_from_lines(text.splitlines())
+        cleaned = clean.clean_lines(lines).tolist()
 
         # Return the cleaned text
         return cleaned
     
+    def split(self, text: str, n: int) -> list[str]:
+        """Splits the text into at most n parts at message block boundaries.
+        
+        Each part other than the first starts with a block header, so the
+        parts can be cleaned and standardized independently of each other.
+        """
+
+        # Find the start of the first message block
+        expression = re.compile(self._BLOCK_EXPRESSION, re.MULTILINE)
+        first = expression.search(text)
+        if first is None:
+            return [text]
+
+        # Split at the first block header after each evenly spaced position
+        bounds = [0]
+        for i in range(1, n):
+            position = max(len(text) * i // n, first.end(), bounds[-1] + 1)
+            for match in expression.finditer(text, position):
+                if self._is_header(match.group(0)):
+                    bounds.append(match.start())
+                    break
+        bounds.append(len(text))
+
+        # Return the parts of the text
+        return [text[i:j] for i, j in zip(bounds, bounds[1:])]
+
     def standardize(self, lines: list[Any]) -> pd.DataFrame:
         """Standardizes the given lines of text.
         
@@ -120,32 +305,54 @@ class Tansee(Parser):
         dataframe that follows a standardized format.
         """
         
-        # Convert the given lines into message blocks
+        # Convert the given lines into message blocks and standardize them
         blocks = clean.to_blocks(lines, self._BLOCK_EXPRESSION, dead_lines=1)
-        headers, messages = zip(*blocks)
+        return self._standardize_blocks(blocks)
+
+    def _standardize_blocks(self, blocks: list[list[str]]) -> pd.DataFrame:
+        """Standardizes the given message blocks."""
+
+        # Separate the headers from the first line of the messages
+        headers = [block[0] for block in blocks]
+        messages = [block[1] for block in blocks]
         
         # Extract information from the headers of each block
-        groups = [re.search(self._BLOCK_EXPRESSION, line) for line in headers]
-        directions = [self._to_sender_bool(group.group(1)) for group in groups]
-        datetimes = [self._to_datetime(group.group(4)) for group in groups]
-        reacts = [reactions.Reactions.get_reaction(line) for line in messages]
+        extracted = self.extract_headers(headers)
+        directions = extracted['is_sender'].to_numpy()
+        datetimes = extracted['datetime'].to_numpy()
+        reacts = reactions.Reactions.get_reactions(messages).to_numpy()
 
         # Create the standardized dataframe and set the index and return
         data = zip(self._LABELS, (datetimes, directions, messages, reacts))
         return pd.DataFrame(dict(data)).set_index(['datetime'])
-    
-    def _to_datetime(self, text: str) -> datetime:
-        """Converts a Tansee datetime string to a Python datetime object."""
+
+    def extract_headers(self, headers: Iterable[str]) -> pd.DataFrame:
+        """Extracts information from block headers in a single columnar pass.
         
-        return datetime.strptime(text, self._DATETIME_FORMAT)
-    
-    def _to_sender_bool(self, text: str) -> bool:
-        """Convert is_sender strings to boolean values."""
+        Returns a dataframe with the direction, name, phone, and datetime of
+        each header, as well as the is_sender boolean derived from the
+        direction. Datetimes are parsed in bulk into datetime64 values.
+        """
 
-        return {
-            'Send To': True,
-            'From': False,
-        }.get(text, None)
+        # Split every header into its components at once
+        headers = pd.Series(headers, dtype=object)
+        extracted = headers.str.extract(self._BLOCK_EXPRESSION)
+        extracted.columns = self._HEADER_LABELS
+
+        # Convert the direction and datetime columns in bulk
+        extracted['is_sender'] = extracted['direction'].map(self._DIRECTIONS)
+        extracted['datetime'] = pd.to_datetime(
+            extracted['datetime'], format=self._DATETIME_FORMAT,
+        )
+
+        # Return the extracted header information
+        return extracted
+
+    def _is_header(self, line: str) -> bool:
+        """Determines whether a line is a block header once it is cleaned."""
+
+        cleaned = clean.clean_line(clean.remove_urls(line))
+        return re.match(self._BLOCK_EXPRESSION, cleaned) is not None
 
 
 class Random(Tansee):
@@ -155,11 +362,22 @@ class Random(Tansee):
     demesstify.testing.messages module.
     """
 
-    def __init__(self, **kwargs):
-        """Initializes the Random instance."""
+    def __init__(self,
+        stream: bool=False, chunk_size: Optional[int]=None,
+        workers: Optional[int]=None, **kwargs,
+    ):
+        """Initializes the Random instance.
+        
+        For information on stream, chunk_size, and workers, see the Tansee
+        parser. Since the dummy text is generated in memory, streaming only
+        builds the dataframe in chunks.
+        """
 
         # Store instance variables
         self._kwargs = kwargs
+        self._stream = stream
+        self._chunk_size = chunk_size or self._CHUNK_SIZE
+        self._workers = workers
         
         # Parse the input
         self._parsed = self.parse()
@@ -168,6 +386,10 @@ class Random(Tansee):
         """Generates dummy text and returns the data as a string."""
         return messages.generate_sample_text(**self._kwargs)
 
+    def iter_lines(self) -> Iterator[str]:
+        """Generates dummy text and yields its lines."""
+        yield from self.load().splitlines()
+
 
 class iMessageCSV(Parser):
     """Parses an iMessage csv.
@@ -181,12 +403,33 @@ class iMessageCSV(Parser):
     It is also assumed that there is a header in this csv file.
     """
 
-    def __init__(self, path: str, delimiter: str=','):
-        """Initializes the iMessageCSV instance."""
+    def __init__(self,
+        path: str, delimiter: str=',', tz: Optional[Union[str, tzinfo]]=None,
+        stream: bool=False, chunk_size: Optional[int]=None,
+        workers: Optional[int]=None,
+    ):
+        """Initializes the iMessageCSV instance.
+        
+        If a time zone is specified, the datetimes will be aware and in that
+        time zone. Otherwise, they will be naive and in local time.
+
+        If stream is True, the csv file is read line by line and the
+        dataframe is built chunk_size rows at a time, so that memory usage
+        does not scale with the size of the file.
+
+        Otherwise, if workers is greater than one, the rows of the csv file
+        are split into ranges that are cleaned and standardized in that many
+        processes. See Parser.parse for the requirements of using more than
+        one worker.
+        """
 
         # Store instance variables
         self._path = path
         self._delimiter = delimiter
+        self._tz = tz
+        self._stream = stream
+        self._chunk_size = chunk_size or self._CHUNK_SIZE
+        self._workers = workers
 
         # Parse the input
         self._parsed = self.parse()
@@ -195,6 +438,39 @@ class iMessageCSV(Parser):
         """Gets the standardized dataframe."""
         return self._parsed
 
+    def iter_chunks(self,
+        chunk_size: Optional[int]=None,
+    ) -> Iterator[pd.DataFrame]:
+        """Lazily parses the csv file into standardized dataframe chunks.
+        
+        Each chunk contains at most chunk_size rows. If chunk_size is not
+        specified, the instance's chunk size is used. A single empty chunk is
+        yielded if the csv file does not contain any rows.
+        """
+
+        # Use the instance's chunk size if one is not specified
+        if chunk_size is None:
+            chunk_size = self._chunk_size
+
+        # Read the lines in the same manner as load, skipping the header
+        with open(self._path, 'r') as csv_file:
+            lines = clean.split_lines(csv_file)
+            next(lines, None)
+
+            # Standardize the rows whenever enough of them have been collected
+            rows = []
+            yielded = False
+            for row in csv.reader(lines, delimiter=self._delimiter):
+                rows.append(row)
+                if len(rows) >= chunk_size:
+                    yield self.parse_partition(rows)
+                    rows = []
+                    yielded = True
+
+            # Standardize any remaining rows, even if there are none at all
+            if rows or not yielded:
+                yield self.parse_partition(rows)
+
     def load(self) -> str:
         """Loads the csv file and returns the data as a string."""
         
@@ -203,31 +479,55 @@ class iMessageCSV(Parser):
             return csv_file.read()
 
     def clean(self, text: str) -> list[Any]:
-        """Cleans the input csv text and separates into lines."""
+        """Cleans the input csv text and separates into columns."""
+        return self._clean_rows(self._read_rows(text))
+
+    def split(self, text: str, n: int) -> list[list[list[str]]]:
+        """Splits the rows of the csv text into at most n ranges.
+        
+        The text is read as csv before splitting so that messages that span
+        multiple lines are never split apart.
+        """
 
-        # Remove URLs from the text - done first to be more efficient
-        text = clean.remove_urls(text)
+        # Split the rows into evenly sized ranges
+        rows = self._read_rows(text)
+        bounds = [len(rows) * i // n for i in range(n + 1)]
+        partitions = [rows[i:j] for i, j in zip(bounds, bounds[1:]) if i < j]
+        return partitions or [rows]
+
+    def parse_partition(self, rows: list[list[str]]) -> pd.DataFrame:
+        """Cleans and standardizes a range of rows of the csv file."""
+        return self.standardize(self._clean_rows(rows))
+
+    def _read_rows(self, text: str) -> list[list[str]]:
+        """Reads the rows of the csv text, excluding the header."""
 
         # Split the text by line and create a csv reader object
         lines = text.splitlines()[1:] # ignore the header
-        reader = csv.reader(lines, delimiter=self._delimiter)
-        
-        # Clean each row of the csv file
-        cleaned = []
-        for r, (datetime, is_sender, message) in enumerate(reader):
-            datetime = clean.convert_mactime_to_datetime(datetime)
-            is_sender = self._to_sender_bool(is_sender)
-            cleaned.append([datetime, is_sender, clean.clean_line(message)])
+        return list(csv.reader(lines, delimiter=self._delimiter))
 
-        # Return the cleaned text
-        return cleaned
+    def _clean_rows(self, rows: Iterable[list[str]]) -> list[Any]:
+        """Cleans rows of the csv file and separates into columns."""
+        
+        # Split each row of the csv file into its columns
+        dates, directions, messages = [], [], []
+        for date, is_sender, message in rows:
+            dates.append(int(date))
+            directions.append(self._to_sender_bool(is_sender))
+            messages.append(message)
+
+        # Clean all of the dates and messages at once and return the columns
+        datetimes = clean.convert_mactimes_to_datetimes(dates, tz=self._tz)
+        messages = clean.remove_urls_from_lines(messages)
+        messages = clean.clean_lines(messages).tolist()
+        return [datetimes, directions, messages]
     
-    def standardize(self, lines: list[Any]) -> pd.DataFrame:
-        """Standardizes the given lines of text."""
+    def standardize(self, columns: list[Any]) -> pd.DataFrame:
+        """Standardizes the given columns of text."""
         
-        # Extract information from the given sublists
-        datetimes, directions, messages = zip(*lines)
-        reacts = [reactions.Reactions.get_reaction(line) for line in messages]
+        # Extract information from the given columns
+        datetimes, directions, messages = columns
+        reacts = reactions.Reactions.get_reactions(messages).to_numpy()
 
         # Create the standardized dataframe and set the index and return
         data = zip(self._LABELS, (datetimes, directions, messages, reacts))
@@ -248,12 +548,36 @@ class iMessageDB(iMessageCSV):
     def __init__(self,
         path: Optional[str]=None, handle_id: Optional[int]=None,
         phone: Optional[str]=None, email: Optional[str]=None,
+        tz: Optional[Union[str, tzinfo]]=None,
+        after_rowid: int=0, until_rowid: int=db.chat.MAX_ROWID,
+        start: Optional[Union[str, datetime]]=None,
+        end: Optional[Union[str, datetime]]=None,
+        stream: bool=False, chunk_size: Optional[int]=None,
+        handle_ids: Optional[Sequence[int]]=None, by_handle: bool=False,
+        workers: Optional[int]=None, chatdb: Optional[db.chat.ChatDB]=None,
     ):
         """Initializes the iMessageDB instance.
         
         If no path is provided, the database will be assumed to be at its
         default location.
 
+        If a ChatDB instance is provided as chatdb, it is used to query the
+        database instead of opening new connections, and the path is ignored.
+
+        If stream is True, the query results are fetched, cleaned, and
+        standardized chunk_size messages at a time, so that memory usage does
+        not scale with the size of the database.
+
+        If a time zone is specified, the datetimes will be aware and in that
+        time zone. Otherwise, they will be naive and in local time.
+
+        Only messages with a ROWID greater than after_rowid and less than or
+        equal to until_rowid are read, which allows for incremental reading.
+
+        If start and/or end are specified, only messages sent within that time
+        interval are read from the database. See ChatDB.get_all_messages for
+        more information.
+
         At least one of the following parameters can be specified:
             handle_id, phone, email
         If more than one of them is provided, only the first will be used
@@ -261,6 +585,17 @@ class iMessageDB(iMessageCSV):
 
         However, if none of the parameters are specified, the entire 
         database will be read.
+
+        Alternatively, messages with several handles can be read in a single
+        query by specifying handle_ids. If by_handle is True, messages with
+        those handles, or every handle if handle_ids is not specified, are
+        indexed by handle ID and then by datetime instead of only by
+        datetime, so that each conversation can be sliced out of the results.
+
+        If workers is greater than one, the query results are split into
+        ranges of rows that are cleaned and standardized in that many
+        processes. See Parser.parse for the requirements of using more than
+        one worker.
         """
 
         # Store instance variables
@@ -268,59 +603,274 @@ class iMessageDB(iMessageCSV):
         self._handle_id = handle_id
         self._phone = phone
         self._email = email
-
-        # Delimiter is necessary for some of the parent's methods
-        self._delimiter = ','
+        self._tz = tz
+        self._after_rowid = after_rowid
+        self._until_rowid = until_rowid
+        self._start, self._end = clean.to_datetime_bounds(start, end, tz=tz)
+        self._stream = stream
+        self._chunk_size = chunk_size or self._CHUNK_SIZE
+        self._handle_ids = handle_ids
+        self._by_handle = by_handle
+        self._workers = workers
+        self._chatdb = chatdb
 
         # Parse the input
         self._parsed = self.parse()
     
-    def load(self) -> str:
-        """Loads the csv file and returns the data as a string."""
+    def load(self) -> pd.DataFrame:
+        """Queries the database and returns the resulting dataframe."""
 
         # Query the database depending on what parameters were provided
-        chatdb = db.chat.ChatDB(self._path)
-        if self._handle_id:
-            df = chatdb.get_messages_from_handle_id(self._handle_id)
-        elif self._phone:
-            df = chatdb.get_messages_from_phone(self._phone)
-        elif self._email:
-            df = chatdb.get_messages_from_email(self._email)
-        else:
-            df = chatdb.get_all_messages()
+        options = self._get_query_options()
+        with self._connect() as chatdb:
+            if self._by_handle or self._handle_ids is not None:
+                df = chatdb.get_messages_from_handle_ids(
+                    self._handle_ids, by_handle=self._by_handle, **options,
+                )
+            elif self._handle_id:
+                df = chatdb.get_messages_from_handle_id(
+                    self._handle_id, **options,
+                )
+            elif self._phone:
+                df = chatdb.get_messages_from_phone(self._phone, **options)
+            elif self._email:
+                df = chatdb.get_messages_from_email(self._email, **options)
+            else:
+                df = chatdb.get_all_messages(**options)
+        return df
+
+    def iter_chunks(self,
+        chunk_size: Optional[int]=None,
+    ) -> Iterator[pd.DataFrame]:
+        """Lazily queries the database in standardized dataframe chunks.
+        
+        Each chunk contains at most chunk_size messages. If chunk_size is not
+        specified, the instance's chunk size is used.
+        """
+
+        # Use the instance's chunk size if one is not specified
+        if chunk_size is None:
+            chunk_size = self._chunk_size
+
+        # Query the database depending on what parameters were provided
+        options = self._get_query_options()
+        options['chunk_size'] = chunk_size
+        with self._connect() as chatdb:
+            if self._by_handle or self._handle_ids is not None:
+                chunks = chatdb.iter_messages_from_handle_ids(
+                    self._handle_ids, by_handle=self._by_handle, **options,
+                )
+            elif self._handle_id:
+                chunks = chatdb.iter_messages_from_handle_id(
+                    self._handle_id, **options,
+                )
+            elif self._phone:
+                chunks = chatdb.iter_messages_from_phone(self._phone, **options)
+            elif self._email:
+                chunks = chatdb.iter_messages_from_email(self._email, **options)
+            else:
+                chunks = chatdb.iter_all_messages(**options)
+
+            # Clean and standardize each chunk as it is read
+            for chunk in chunks:
+                yield self.standardize(self.clean(chunk))
+
+    def split(self, dataframe: pd.DataFrame, n: int) -> list[pd.DataFrame]:
+        """Splits the query results into at most n ranges of rows."""
+
+        bounds = [len(dataframe) * i // n for i in range(n + 1)]
+        partitions = [
+            dataframe.iloc[i:j] for i, j in zip(bounds, bounds[1:]) if i < j
+        ]
+        return partitions or [dataframe]
+
+    def parse_partition(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        """Cleans and standardizes a range of rows of the query results."""
+        return self.standardize(self.clean(dataframe))
+
+    def clean(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        """Cleans the query results using column operations.
+        
+        The query results are expected to have the following columns:
+            date, is_from_me, text
+        """
+
+        # Remove URLs from and clean every message at once
+        messages = dataframe['text'].fillna('').astype(str)
+        messages = clean.clean_lines(clean.remove_urls_from_lines(messages))
+
+        # Create the cleaned dataframe
+        cleaned = pd.DataFrame({
+            'datetime': clean.convert_mactimes_to_datetimes(
+                dataframe['date'], tz=self._tz,
+            ),
+            'is_sender': dataframe['is_from_me'].astype(bool).to_numpy(),
+            'message': messages.to_numpy(),
+        })
+
+        # Keep track of which handle each message belongs to if necessary
+        if self._by_handle:
+            cleaned.insert(0, 'handle_id', dataframe['handle_id'].to_numpy())
+        return cleaned
+
+    def standardize(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        """Standardizes the cleaned query results."""
+
+        # Detect the reactions in every message at once
+        reacts = reactions.Reactions.get_reactions(dataframe['message'])
 
-        # Return the csv string with \r\n terminator to avoid parsing errors
-        return df.to_csv(index=False, line_terminator='\r\n')
+        # Index by handle ID as well as datetime if necessary
+        index = ['handle_id', 'datetime'] if self._by_handle else ['datetime']
+
+        # Create the standardized dataframe and set the index and return
+        labels = [*index[:-1], *self._LABELS]
+        dataframe = dataframe.assign(reaction=reacts)[labels]
+        return dataframe.set_index(index)
+
+    def _connect(self) -> ContextManager[db.chat.ChatDB]:
+        """Gets the ChatDB instance to query the database with.
+        
+        The provided instance is not closed after use, but one that is
+        created for the query is.
+        """
+
+        if self._chatdb is not None:
+            return contextlib.nullcontext(self._chatdb)
+        return db.chat.ChatDB(self._path)
+
+    def _get_query_options(self) -> dict[str, Any]:
+        """Gets the keyword arguments that filter the database query."""
+
+        return {
+            'after_rowid': self._after_rowid,
+            'until_rowid': self._until_rowid,
+            'start': self._start,
+            'end': self._end,
+        }
+
+
+class _CachedSource:
+    """Loads standardized data through the parse cache.
+
+    Subclasses set the _source, _path, _cache, _compact, _chatdb, and
+    _last_rowid instance variables, which identify the cached data.
+    """
+
+    # Parser options that do not change the parsed data
+    _EXECUTION_OPTIONS = ('stream', 'chunk_size', 'workers')
+
+    def _load_cached(self,
+            parse: Callable[[], pd.DataFrame], **options,
+        ) -> pd.DataFrame:
+        """Loads the data from the cache, or parses and stores it."""
+
+        key = self._get_cache_key(**options)
+        data = self._cache.load(key)
+        if data is None:
+            data = parse()
+            self._cache.store(key, data)
+        elif self._compact:
+            # The cache does not preserve Arrow-backed strings
+            data = Parser.compact(data)
+        return data
+
+    def _get_cache_key(self, **options) -> str:
+        """Gets the cache key of the source and parsing options."""
+
+        # Ignore options that only affect how the source is parsed
+        for option in self._EXECUTION_OPTIONS:
+            options.pop(option, None)
+
+        # Keep compact data separate from data with the standard column types
+        if self._compact:
+            options['compact'] = True
+        return self._cache.get_key(self._fingerprint(), **options)
+
+    def _fingerprint(self) -> dict[str, Any]:
+        """Gets the fingerprint of the source for caching purposes."""
+
+        fingerprint = {'source': self._source.value}
+        if self._source == Source.IMESSAGE_DB:
+            fingerprint.update(self._cache.fingerprint_database(
+                self._path, rowid=self._last_rowid, chatdb=self._chatdb,
+            ))
+        else:
+            fingerprint.update(self._cache.fingerprint_file(self._path))
+        return fingerprint
 
 
-class Messages:
+class Messages(_CachedSource):
     """The main object to handle message data."""
 
     def __init__(self,
         path: Optional[str]=None,
         source: Union[str, Source]=Source.IMESSAGE_DB,
+        cache: Union[bool, ParseCache]=False,
+        lazy: bool=False,
+        compact: bool=False,
+        chatdb: Optional[db.chat.ChatDB]=None,
         **kwargs,
     ):
-        """Initializes the Messages instance."""
+        """Initializes the Messages instance.
+        
+        When reading the iMessage database, a ChatDB instance is kept for as
+        long as the object exists, and it is reused to load, update, and
+        fingerprint the messages. An existing instance can be provided as
+        chatdb so that it is shared with other objects, such as Attachments.
+        Otherwise, the instance is closed by close(), or automatically when
+        used as a context manager.
+        
+        If cache is True or a ParseCache instance, the standardized data is
+        stored on disk and reused for as long as the source does not change.
+        Randomly generated data is never cached.
+
+        If lazy is True, the source is not parsed until its data is first
+        accessed. If the data is trimmed before then, only the messages
+        within the time interval are read from sources that support it, which
+        is currently only the iMessage database.
+
+        If compact is True, the data is stored using compact column types,
+        which use much less memory for large conversations. See
+        Parser.compact for more information.
+        """
 
         # Convert source to enumeration if necessary
         if isinstance(source, str):
             source = Source(source)
+        # Use the default cache if caching is enabled
+        if cache is True:
+            cache = ParseCache()
+        # Keep a connection to the database for as long as the object exists
+        owns_chatdb = chatdb is None and source == Source.IMESSAGE_DB
+        if owns_chatdb:
+            chatdb = db.chat.ChatDB(path)
         
         # Store instance variables
         self._path = path
         self._source = source
+        self._cache = cache or None
+        self._compact = compact
+        self._chatdb = chatdb
+        self._owns_chatdb = owns_chatdb
+        self._kwargs = kwargs
+        self._last_rowid = None
+        self._trim_bounds = []
+        self._data = None
+        self._sorted = None
+        self._masks = {}
+        self._partitions = {}
 
-        # Get the data from the appropriate parser
-        if self._source == Source.RANDOM:
-            parser = Random(**kwargs)
-        elif self._source == Source.TANSEE:
-            parser = Tansee(self._path)
-        elif self._source == Source.IMESSAGE_CSV:
-            parser = iMessageCSV(self._path)
-        elif self._source == Source.IMESSAGE_DB:
-            parser = iMessageDB(self._path, **kwargs)
-        self._data = parser.get()
+        # Get the data from the cache or the appropriate parser, if desired
+        if not lazy:
+            self._set_data(self._load(**kwargs))
+
+    def __enter__(self) -> 'Messages':
+        """Enters the runtime context of the Messages object."""
+        return self
+
+    def __exit__(self, *args):
+        """Closes the connections when exiting the runtime context."""
+        self.close()
 
     @classmethod
     def from_random(cls, **kwargs) -> 'Messages':
@@ -332,20 +882,52 @@ class Messages:
         return cls(source=Source.RANDOM, **kwargs)
 
     @classmethod
-    def from_tansee(cls, path: str) -> 'Messages':
-        """Initializes a Messages object using a Tansee text file."""
-        return cls(path=path, source=Source.TANSEE)
+    def from_tansee(cls, path: str, **kwargs) -> 'Messages':
+        """Initializes a Messages object using a Tansee text file.
+        
+        For kwarg information, see the Tansee parser.
+        """
+        return cls(path=path, source=Source.TANSEE, **kwargs)
 
     @classmethod
-    def from_imessage_csv(cls, path: str) -> 'Messages':
-        """Initializes a Messages object using an iMessage CSV file."""
-        return cls(path=path, source=Source.IMESSAGE_CSV)
+    def from_imessage_csv(cls, path: str, **kwargs) -> 'Messages':
+        """Initializes a Messages object using an iMessage CSV file.
+        
+        For kwarg information, see the iMessageCSV parser.
+        """
+        return cls(path=path, source=Source.IMESSAGE_CSV, **kwargs)
 
     @classmethod
     def from_imessage_db(cls, path: Optional[str]=None, **kwargs) -> 'Messages':
         """Initializes a Messages object using the local iMessage database."""
         return cls(path=path, source=Source.IMESSAGE_DB, **kwargs)
 
+    @classmethod
+    def from_imessage_db_handles(cls,
+            path: Optional[str]=None,
+            handle_ids: Optional[Sequence[int]]=None,
+            **kwargs,
+        ) -> 'MessagesByHandle':
+        """
+        Initializes Messages objects for many handles of the local iMessage
+        database using a single query.
+        
+        If handle_ids is not specified, every handle is loaded. For more
+        information, see MessagesByHandle.
+        """
+        return MessagesByHandle(path, handle_ids=handle_ids, **kwargs)
+
+    def close(self):
+        """Closes the connections of the ChatDB instance it created.
+        
+        A ChatDB instance that was provided as chatdb is left open. The
+        messages can still be used afterwards, and connections are reopened
+        if the database is read again, such as by update.
+        """
+
+        if self._owns_chatdb:
+            self._chatdb.close()
+
     def get(self, which: Union[str, Direction]=Direction.ALL) -> pd.DataFrame:
         """Gets the message dataframe."""
 
@@ -363,15 +945,23 @@ class Messages:
     
     def get_all(self) -> pd.DataFrame:
         """Gets the unfiltered main dataframe."""
-        return self._data
+        return self._get_data()
     
     def get_sent(self) -> pd.DataFrame:
-        """Gets the main dataframe filtered by sent messages."""
-        return self._data[self._data['is_sender'] == 1]
+        """Gets the main dataframe filtered by sent messages.
+        
+        The dataframe is cached, and shared between calls until the data
+        changes, so it should be copied before being modified.
+        """
+        return self._get_partition(Direction.SENT)
     
     def get_received(self) -> pd.DataFrame:
-        """Gets the main dataframe filtered by received messages."""
-        return self._data[self._data['is_sender'] == 0]
+        """Gets the main dataframe filtered by received messages.
+        
+        The dataframe is cached, and shared between calls until the data
+        changes, so it should be copied before being modified.
+        """
+        return self._get_partition(Direction.RECEIVED)
 
     def as_string(self, 
             which: Union[str, Direction]=Direction.ALL,
@@ -379,16 +969,68 @@ class Messages:
         ) -> str:
         """Gets the message data as a string, separated by new lines."""
         
-        # Get the appropriately filtered data
-        data = self.get(which=which)
+        # Convert directionality to enumeration if necessary
+        if isinstance(which, str):
+            which = Direction(which)
 
-        # Remove reactions if specified
-        if not include_reactions:
-            data = self._remove_reactions(data)
+        # Get the appropriately filtered data, removing reactions if specified
+        data = self._get_partition(which, include_reactions=include_reactions)
 
         # Return the message string
         return '\n'.join(data['message'])
 
+    def update(self) -> pd.DataFrame:
+        """Appends messages that were added to the source since loading.
+        
+        Only messages that are newer than the last message that was read are
+        queried, so this is much faster than reloading the entire source.
+        If the data was trimmed, only the new messages within the time
+        interval are appended. The cache is also updated if caching is
+        enabled, unless the data was trimmed, as it then no longer holds
+        every message of the source.
+
+        This is currently only supported for the iMessage database. Returns
+        the dataframe of new messages.
+        """
+
+        # Make sure the source supports incremental updates
+        if self._source != Source.IMESSAGE_DB:
+            raise ValueError((
+                f"Updating is not supported for the '{self._source.value}' "
+                f"source. Only the '{Source.IMESSAGE_DB.value}' source can be "
+                "updated."
+            ))
+
+        # Make sure the messages were loaded in the first place
+        data = self._get_data()
+
+        # Parse the messages that were added since the last one that was read
+        last_rowid = self._chatdb.get_last_rowid()
+        new = iMessageDB(
+            self._path, after_rowid=self._last_rowid, until_rowid=last_rowid,
+            chatdb=self._chatdb, **self._kwargs,
+        ).get()
+        if self._compact:
+            new = Parser.compact(new)
+        self._last_rowid = last_rowid
+
+        # Only keep the new messages within the intervals that were trimmed to
+        for start, end in self._trim_bounds:
+            new = self._trim_data(new, start, end)
+
+        # Append the new messages, keeping the data in chronological order
+        data = pd.concat([data, new])
+        if not data.index.is_monotonic_increasing:
+            data = data.sort_index(kind='stable')
+        self._set_data(data)
+
+        # Replace the cached data with the updated data if it is complete
+        if self._cache is not None and not self._trim_bounds:
+            self._cache.store(self._get_cache_key(**self._kwargs), self._data)
+
+        # Return the new messages
+        return new
+
     def trim(self, start: str, end: str, replace: bool=True) -> pd.DataFrame:
         """
         Trims the data to messages sent between a specified time interval.
@@ -398,13 +1040,471 @@ class Messages:
             %Y-%m-%d %H:%M:%S
             %Y-%m-%d
         That said, other formats may work.
+
+        If the data has not been loaded yet, only the messages within the
+        time interval are read from the source if it supports it.
         """
 
-        trimmed = self._data.loc[start:end]
+        # Push the time interval down to the source if nothing is loaded yet
+        if self._data is None and self._supports_trim_pushdown():
+            data = self._load(**self._kwargs, start=start, end=end)
+        else:
+            data = self._get_data()
+
+        # Replace the data if desired, remembering the interval for updates
+        trimmed = self._trim_data(data, start, end)
         if replace:
-            self._data = trimmed
+            self._trim_bounds.append((start, end))
+            self._set_data(trimmed)
+
+        # Return the trimmed data
         return trimmed
 
-    def _remove_reactions(self, data: pd.DataFrame) -> pd.DataFrame:
-        """Filters out reactions from a message dataframe."""
-        return data[data['reaction'].isnull()]
\ No newline at end of file
+    def get_window(self,
+            start: Optional[Union[str, datetime]]=None,
+            end: Optional[Union[str, datetime]]=None,
+        ) -> pd.DataFrame:
+        """Gets the messages sent between start and end (inclusive).
+        
+        Unlike trim, the data is not replaced. The bounds are interpreted in
+        the same way as in trim, and either can be omitted. See get_windows
+        for more information.
+        """
+        return self.get_windows([(start, end)])[0]
+
+    def get_windows(self,
+            bounds: Iterable[tuple[
+                Optional[Union[str, datetime]], Optional[Union[str, datetime]]
+            ]],
+        ) -> list[pd.DataFrame]:
+        """Gets the messages sent within each of many time intervals at once.
+        
+        The bounds are (start, end) pairs, which are interpreted in the same
+        way as in get_window. The positions of every interval are found with
+        binary search on the chronologically sorted data, and each window is
+        a slice of that data rather than a copy. Like the dataframe returned
+        by get_all, the windows should be copied before being modified.
+        """
+
+        # Find the positions of every interval in the sorted data
+        data = self._get_sorted_data()
+        lefts, rights = self._get_positions(data.index, bounds)
+
+        # Return a slice of the sorted data for each interval
+        return [data.iloc[i:j] for i, j in zip(lefts, rights)]
+
+    def iter_periods(self,
+            freq: str='W',
+        ) -> Iterator[tuple[pd.Period, pd.DataFrame]]:
+        """Lazily gets the messages sent within each period of time.
+        
+        The frequency is a pandas period alias, such as 'D', 'W', 'M', or
+        'Y'. A tuple of each period and its window is yielded for every period
+        from the first message to the last, including periods without any
+        messages. See get_windows for more information.
+        """
+
+        # Nothing is yielded if there are no messages
+        data = self._get_sorted_data()
+        if data.empty:
+            return
+
+        # Get every period between the first and last messages, in local time
+        first, last = data.index[0], data.index[-1]
+        if data.index.tz is not None:
+            first, last = first.tz_localize(None), last.tz_localize(None)
+        periods = pd.period_range(
+            pd.Period(first, freq), pd.Period(last, freq), freq=freq,
+        )
+
+        # Find the positions of every period at once
+        bounds = [(period.start_time, period.end_time) for period in periods]
+        lefts, rights = self._get_positions(data.index, bounds)
+
+        # Slice out the window of each period only once it is needed
+        for period, i, j in zip(periods, lefts, rights):
+            yield period, data.iloc[i:j]
+
+    @property
+    def is_loaded(self) -> bool:
+        """Gets whether the data has been loaded from the source."""
+        return self._data is not None
+
+    @property
+    def path(self) -> Optional[str]:
+        """Gets the path of the source."""
+        return self._path
+
+    @property
+    def source(self) -> Source:
+        """Gets the type of the source."""
+        return self._source
+
+    @property
+    def chatdb(self) -> Optional[db.chat.ChatDB]:
+        """Gets the ChatDB instance used to read the iMessage database."""
+        return self._chatdb
+
+    def _get_data(self) -> pd.DataFrame:
+        """Gets the data, loading it from the source first if necessary."""
+
+        if self._data is None:
+            self._set_data(self._load(**self._kwargs))
+        return self._data
+
+    def _set_data(self, data: pd.DataFrame):
+        """Replaces the data, invalidating anything derived from it."""
+
+        self._data = data
+        self._sorted = None
+        self._masks = {}
+        self._partitions = {}
+
+    def _get_sorted_data(self) -> pd.DataFrame:
+        """Gets the data with a chronologically sorted datetime index.
+        
+        The data itself is used if it is already sorted, which is almost
+        always the case. Otherwise, a sorted copy is made and cached until
+        the data changes.
+        """
+
+        if self._sorted is None:
+            data = self._get_data()
+            if not isinstance(data.index, pd.DatetimeIndex):
+                data = data.set_axis(pd.DatetimeIndex(data.index), axis=0)
+            if not data.index.is_monotonic_increasing:
+                data = data.sort_index(kind='stable')
+            self._sorted = data
+        return self._sorted
+
+    def _trim_data(self,
+            data: pd.DataFrame, start: str, end: str,
+        ) -> pd.DataFrame:
+        """Gets the messages of data sent between start and end."""
+
+        # Use binary search to find the interval if the data is sorted
+        if data.index.is_monotonic_increasing:
+            left, right = self._get_positions(data.index, [(start, end)])
+            return data.iloc[left[0]:right[0]]
+        return data.loc[start:end]
+
+    def _get_positions(self,
+            index: pd.DatetimeIndex,
+            bounds: Iterable[tuple[
+                Optional[Union[str, datetime]], Optional[Union[str, datetime]]
+            ]],
+        ) -> tuple[np.ndarray, np.ndarray]:
+        """Finds the positions of time intervals in a sorted datetime index.
+        
+        Returns the arrays of the first position within each interval and the
+        position just after each interval.
+        """
+
+        # Convert the bounds to timestamps in the time zone of the index
+        starts, ends = [], []
+        for start, end in bounds:
+            start, end = clean.to_datetime_bounds(start, end, tz=index.tz)
+            starts.append(start)
+            ends.append(end)
+
+        # Search for every specified bound at once and return the positions
+        lefts = self._search_positions(index, starts, 'left', 0)
+        rights = self._search_positions(index, ends, 'right', len(index))
+        return lefts, rights
+
+    @staticmethod
+    def _search_positions(
+            index: pd.DatetimeIndex,
+            timestamps: list[Optional[pd.Timestamp]],
+            side: str,
+            default: int,
+        ) -> np.ndarray:
+        """Finds where timestamps belong in a sorted datetime index.
+        
+        Missing timestamps are given the default position.
+        """
+
+        positions = np.full(len(timestamps), default, dtype='int64')
+        given = [i for i, value in enumerate(timestamps) if value is not None]
+        if given:
+            values = pd.DatetimeIndex([timestamps[i] for i in given])
+            positions[given] = index.searchsorted(values, side=side)
+        return positions
+
+    def _get_mask(self, column: str) -> np.ndarray:
+        """Gets a cached boolean mask of the data.
+        
+        The is_sender mask is True for sent messages, and the reaction mask
+        is True for reactions.
+        """
+
+        if column not in self._masks:
+            data = self._get_data()
+            if column == 'is_sender':
+                mask = data['is_sender'].to_numpy(dtype=bool)
+            else:
+                mask = data[column].notna().to_numpy()
+            self._masks[column] = mask
+        return self._masks[column]
+
+    def _get_partition(self,
+            which: Direction, include_reactions: bool=True,
+        ) -> pd.DataFrame:
+        """Gets a cached subset of the data.
+        
+        Each subset is only selected once, by the positions of its messages,
+        and is reused until the data changes through trim or update. Like
+        the dataframe returned by get_all, the subset is shared between
+        calls, so it should be copied before being modified.
+        """
+
+        # Return the cached subset if it has been selected already
+        key = (which, include_reactions)
+        if key in self._partitions:
+            return self._partitions[key]
+
+        # Combine the masks of the subset
+        data = self._get_data()
+        mask = np.ones(len(data), dtype=bool)
+        if which == Direction.SENT:
+            mask &= self._get_mask('is_sender')
+        elif which == Direction.RECEIVED:
+            mask &= ~self._get_mask('is_sender')
+        if not include_reactions:
+            mask &= ~self._get_mask('reaction')
+
+        # Select the subset by position, unless every message is in it
+        if mask.all():
+            subset = data
+        else:
+            subset = data.iloc[np.flatnonzero(mask)]
+        self._partitions[key] = subset
+        return subset
+
+    def _supports_trim_pushdown(self) -> bool:
+        """Determines whether the source can be read within a time interval.
+        
+        Only the iMessage database can, as long as no interval was already
+        specified when initializing.
+        """
+
+        if self._source != Source.IMESSAGE_DB:
+            return False
+        return 'start' not in self._kwargs and 'end' not in self._kwargs
+
+    @classmethod
+    def _from_data(cls,
+            data: pd.DataFrame,
+            path: Optional[str]=None,
+            source: Source=Source.IMESSAGE_DB,
+            last_rowid: Optional[int]=None,
+            compact: bool=False,
+            chatdb: Optional[db.chat.ChatDB]=None,
+            **kwargs,
+        ) -> 'Messages':
+        """Initializes a Messages object with already standardized data."""
+
+        # Store instance variables without parsing the source again
+        messages = cls.__new__(cls)
+        messages._path = path
+        messages._source = source
+        messages._cache = None
+        messages._compact = compact
+        messages._chatdb = chatdb
+        messages._owns_chatdb = False
+        messages._kwargs = kwargs
+        messages._last_rowid = last_rowid
+        messages._trim_bounds = []
+        messages._set_data(data)
+        return messages
+
+    def _load(self, **kwargs) -> pd.DataFrame:
+        """Loads the data from the cache, or parses it if necessary."""
+
+        # Pin the last message to read so that updates can continue from it
+        if self._source == Source.IMESSAGE_DB:
+            self._last_rowid = self._chatdb.get_last_rowid()
+
+        # Parse the source if caching is not possible
+        if self._cache is None or self._source == Source.RANDOM:
+            return self._parse(**kwargs)
+
+        # Otherwise, attempt to load the data from the cache
+        return self._load_cached(lambda: self._parse(**kwargs), **kwargs)
+
+    def _parse(self, **kwargs) -> pd.DataFrame:
+        """Parses the data with the appropriate parser."""
+
+        if self._source == Source.RANDOM:
+            parser = Random(**kwargs)
+        elif self._source == Source.TANSEE:
+            parser = Tansee(self._path, **kwargs)
+        elif self._source == Source.IMESSAGE_CSV:
+            parser = iMessageCSV(self._path, **kwargs)
+        elif self._source == Source.IMESSAGE_DB:
+            parser = iMessageDB(
+                self._path, until_rowid=self._last_rowid,
+                chatdb=self._chatdb, **kwargs,
+            )
+
+        # Convert to compact column types if desired
+        if self._compact:
+            return Parser.compact(parser.get())
+        return parser.get()
+
+
+class MessagesByHandle(_CachedSource, Mapping):
+    """Maps handle IDs to Messages objects that share one parsing pass.
+
+    The messages with every handle are queried and parsed together, and then
+    stored in a single dataframe that is indexed by handle ID and datetime.
+    The Messages object of a handle is only created once it is accessed, by
+    slicing its conversation out of the shared dataframe:
+
+        conversations = Messages.from_imessage_db_handles(path, [1, 2, 3])
+        for handle_id, messages in conversations.items():
+            ...
+
+    Handles without any messages are not included.
+    """
+
+    def __init__(self,
+            path: Optional[str]=None,
+            handle_ids: Optional[Sequence[int]]=None,
+            cache: Union[bool, ParseCache]=False,
+            lazy: bool=False,
+            compact: bool=False,
+            chatdb: Optional[db.chat.ChatDB]=None,
+            **kwargs,
+        ):
+        """Initializes the MessagesByHandle instance.
+        
+        If handle_ids is not specified, every handle is loaded. The cache,
+        lazy, compact, and chatdb parameters behave as they do in Messages,
+        and apply to the shared dataframe as a whole. The Messages object of
+        each handle shares the ChatDB instance, which is closed by close(),
+        or automatically when used as a context manager, unless it was
+        provided as chatdb. For kwarg information, see the iMessageDB parser.
+        """
+
+        # Use the default cache if caching is enabled
+        if cache is True:
+            cache = ParseCache()
+        # Keep a connection to the database for as long as the object exists
+        owns_chatdb = chatdb is None
+        if owns_chatdb:
+            chatdb = db.chat.ChatDB(path)
+
+        # Store instance variables
+        self._source = Source.IMESSAGE_DB
+        self._path = path
+        self._handle_ids = handle_ids
+        self._cache = cache or None
+        self._compact = compact
+        self._chatdb = chatdb
+        self._owns_chatdb = owns_chatdb
+        self._kwargs = kwargs
+        self._last_rowid = None
+        self._data = None
+        self._loaded_handle_ids = None
+        self._messages = {}
+
+        # Parse the messages with every handle at once, if desired
+        if not lazy:
+            self._get_data()
+
+    def __enter__(self) -> 'MessagesByHandle':
+        """Enters the runtime context of the MessagesByHandle object."""
+        return self
+
+    def __exit__(self, *args):
+        """Closes the connections when exiting the runtime context."""
+        self.close()
+
+    def __getitem__(self, handle_id: int) -> Messages:
+        """Gets the Messages object of the specified handle ID."""
+
+        # Slice the conversation out of the shared data on first access
+        data = self._get_data()
+        if handle_id not in self._messages:
+            if handle_id not in self._loaded_handle_ids:
+                raise KeyError(handle_id)
+            self._messages[handle_id] = Messages._from_data(
+                data.xs(handle_id, level='handle_id'),
+                path=self._path, last_rowid=self._last_rowid,
+                compact=self._compact, chatdb=self._chatdb,
+                handle_id=handle_id, **self._kwargs,
+            )
+        return self._messages[handle_id]
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterates over the handle IDs, in ascending order."""
+        self._get_data()
+        return iter(self._loaded_handle_ids)
+
+    def __len__(self) -> int:
+        """Gets the number of handles with messages."""
+        self._get_data()
+        return len(self._loaded_handle_ids)
+
+    def close(self):
+        """Closes the connections of the ChatDB instance it created.
+        
+        A ChatDB instance that was provided as chatdb is left open.
+        """
+
+        if self._owns_chatdb:
+            self._chatdb.close()
+
+    def get_all(self) -> pd.DataFrame:
+        """Gets the dataframe of every handle's messages.
+        
+        The dataframe is indexed by handle ID and then by datetime.
+        """
+        return self._get_data()
+
+    @property
+    def is_loaded(self) -> bool:
+        """Gets whether the messages have been loaded from the database."""
+        return self._data is not None
+
+    def _get_data(self) -> pd.DataFrame:
+        """Gets the shared data, loading it first if necessary."""
+
+        if self._data is None:
+            self._data = self._load()
+            self._loaded_handle_ids = (
+                self._data.index.unique(level='handle_id').tolist()
+            )
+        return self._data
+
+    def _load(self) -> pd.DataFrame:
+        """Loads the shared data from the cache, or parses it if necessary."""
+
+        # Pin the last message to read so that updates can continue from it
+        self._last_rowid = self._chatdb.get_last_rowid()
+
+        # Parse the database if caching is not enabled
+        if self._cache is None:
+            return self._parse()
+
+        # Otherwise, attempt to load the data from the cache, keeping it
+        # separate from the data of single conversations
+        options = {'by_handle': True, **self._kwargs}
+        if self._handle_ids is not None:
+            options['handle_ids'] = list(self._handle_ids)
+        return self._load_cached(self._parse, **options)
+
+    def _parse(self) -> pd.DataFrame:
+        """Parses the messages with every handle at once."""
+
+        data = iMessageDB(
+            self._path, handle_ids=self._handle_ids, by_handle=True,
+            until_rowid=self._last_rowid, chatdb=self._chatdb,
+            **self._kwargs,
+        ).get()
+
+        # Convert to compact column types if desired
+        if self._compact:
+            return Parser.compact(data)
+        return data
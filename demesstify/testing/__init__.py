@@ -1,2 +1,2 @@
-from . import messages
+from . import database, messages
 from . import settings
\ No newline at end of file
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Provides functionality for creating sample iMessage databases.
+"""
+
+
+import random
+import sqlite3
+from datetime import datetime
+from typing import Optional
+
+import lorem
+
+from . import settings as s
+from .. import clean
+
+
+# Schema of the tables that demesstify reads, modeled after chat.db
+SCHEMA = """
+    CREATE TABLE handle (
+        ROWID INTEGER PRIMARY KEY AUTOINCREMENT UNIQUE,
+        id TEXT NOT NULL
+    );
+    CREATE TABLE message (
+        ROWID INTEGER PRIMARY KEY AUTOINCREMENT,
+        text TEXT,
+        handle_id INTEGER DEFAULT 0,
+        date INTEGER,
+        is_from_me INTEGER DEFAULT 0
+    );
+    CREATE TABLE attachment (
+        ROWID INTEGER PRIMARY KEY AUTOINCREMENT,
+        filename TEXT,
+        transfer_name TEXT
+    );
+    CREATE TABLE message_attachment_join (
+        message_id INTEGER REFERENCES message (ROWID) ON DELETE CASCADE,
+        attachment_id INTEGER REFERENCES attachment (ROWID) ON DELETE CASCADE,
+        UNIQUE(message_id, attachment_id)
+    );
+    CREATE INDEX message_idx_handle ON message(handle_id, date);
+    CREATE INDEX message_idx_date ON message(date);
+"""
+
+
+def generate_handles(n: int) -> list[str]:
+    """Generates a list of n unique phone numbers and emails."""
+
+    handles = []
+    for i in range(n):
+        if i % 4 == 3:
+            handles.append(f'user{i}@example.com')
+        else:
+            handles.append(f'+1555{i:07d}')
+    return handles
+
+
+def generate_sample_database(
+    output_path: str,
+    total_messages: Optional[int]=None,
+    total_handles: Optional[int]=None,
+    start_date: Optional[datetime]=None,
+    end_date: Optional[datetime]=None,
+    attachment_chance: Optional[float]=None,
+    seed: Optional[int]=None,
+) -> list[str]:
+    """Generates a sample database modeled after the iMessage database.
+
+    Messages are spread evenly between start_date and end_date and randomly
+    assigned to one of the generated handles. Returns the list of handle ids.
+    """
+
+    # Get default values from settings if necessary
+    if total_messages is None:
+        total_messages = s.TOTAL_MESSAGES
+    if total_handles is None:
+        total_handles = s.TOTAL_HANDLES
+    if start_date is None:
+        start_date = s.START_DATETIME
+    if end_date is None:
+        end_date = s.END_DATETIME
+    if attachment_chance is None:
+        attachment_chance = s.ATTACHMENT_CHANCE
+
+    # Seed the random number generator for reproducible databases
+    generator = random.Random(seed)
+
+    # Generate the handles and a pool of sentences to draw messages from
+    handles = generate_handles(total_handles)
+    sentences = [lorem.sentence() for _ in range(1000)]
+
+    # Generate the message and attachment rows
+    start = clean.convert_datetime_to_mactime(start_date)
+    end = clean.convert_datetime_to_mactime(end_date)
+    step = (end - start) // max(total_messages, 1)
+    messages, attachments = [], []
+    for i in range(total_messages):
+        text = generator.choice(sentences)
+        if generator.random() < s.EMOJI_CHANCE:
+            text += f' {generator.choice(s.EMOJIS)}'
+        handle_id = generator.randint(1, total_handles)
+        is_from_me = generator.randint(0, 1)
+        messages.append((text, handle_id, start + i*step, is_from_me))
+        if generator.random() < attachment_chance:
+            attachments.append((i + 1, f'~/Attachments/{i}.jpeg', f'{i}.jpeg'))
+
+    # Write the database
+    connection = sqlite3.connect(output_path)
+    with connection:
+        connection.executescript(SCHEMA)
+        connection.executemany(
+            "INSERT INTO handle (id) VALUES (?);",
+            [(handle,) for handle in handles],
+        )
+        connection.executemany(
+            "INSERT INTO message (text, handle_id, date, is_from_me) "
+            "VALUES (?, ?, ?, ?);",
+            messages,
+        )
+        connection.executemany(
+            "INSERT INTO attachment (ROWID, filename, transfer_name) "
+            "VALUES (?, ?, ?);",
+            [(a, filename, name) for a, (_, filename, name) in
+                enumerate(attachments, start=1)],
+        )
+        connection.executemany(
+            "INSERT INTO message_attachment_join VALUES (?, ?);",
+            [(m, a) for a, (m, _, _) in enumerate(attachments, start=1)],
+        )
+    connection.close()
+
+    # Return the handles
+    return handles
@@ -23,3 +23,7 @@ DATE_FORMAT = r'%b %-d, %Y %H:%M:%S'
 START_DATETIME = datetime(2017, 11, 28, 23, 55, 59)
 END_DATETIME = datetime(2017, 12, 25, 17, 11, 22)
 UNIFORMLY_DISTRIBUTED = False
+
+# Specify variables for generating sample databases
+TOTAL_HANDLES = 10
+ATTACHMENT_CHANCE = 0.05
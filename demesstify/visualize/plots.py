@@ -30,14 +30,26 @@ class WeekdayRadialHeatmap:
     _DAYS = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday',
              'Friday', 'Saturday']
 
-    def __init__(self, data: pd.DataFrame):
-        """Initializes the WeekdayRadialHeatmap object."""
+    def __init__(self,
+            data: Optional[pd.DataFrame]=None,
+            hourly_counts: Optional[pd.Series]=None,
+        ):
+        """Initializes the WeekdayRadialHeatmap object.
+        
+        Instead of message data, pre-aggregated hour-of-week counts, such as
+        a column of ChatDB.get_hourly_counts, can be provided as
+        hourly_counts. They should be indexed by weekday, where 0 is Sunday,
+        and by hour.
+        """
 
         # Store instance variables
         self._data = data
         
         # Construct the frequency matrix
-        self._matrix_df = self._construct_frequency_matrix(self._data)
+        if hourly_counts is not None:
+            self._matrix_df = self._construct_matrix_from_counts(hourly_counts)
+        else:
+            self._matrix_df = self._construct_frequency_matrix(self._data)
         self._matrix = self._matrix_df.to_numpy()
 
     def generate(self,
@@ -218,6 +230,18 @@ class WeekdayRadialHeatmap:
         # Fill in missing values in the dataframe
         new_index = list(range(0, 23+1))
         return matrix.reindex(new_index, fill_value=0).fillna(0)
+
+    def _construct_matrix_from_counts(self, counts: pd.Series) -> pd.DataFrame:
+        """
+        Takes pre-aggregated counts indexed by weekday and hour and converts
+        them into the same matrix form as _construct_frequency_matrix.
+        """
+
+        # Pivot the weekdays into columns, filling in missing hours and days
+        matrix = counts.unstack(level=0)
+        matrix = matrix.reindex(index=range(0, 23+1), columns=range(0, 6+1))
+        matrix.columns = self._DAYS
+        return matrix.fillna(0)
     
     def _military_to_standard(self, hour: int) -> str:
         """Converts military hours (24 hours) to standard hours (am/pm)."""
@@ -639,9 +663,17 @@ class StackedFrequencyBarChart(FrequencyBarChart):
 class CalendarHeatmap:
     """Create a calendar heatmap similar to Github's contributions plot."""
 
-    def __init__(self, data: pd.DataFrame, year: Optional[int]=None, **kwargs):
+    def __init__(self,
+            data: Optional[pd.DataFrame]=None,
+            year: Optional[int]=None,
+            daily_counts: Optional[pd.Series]=None,
+            **kwargs,
+        ):
         """Initializes the CalendarHeatmap instance.
         
+        Instead of message data, pre-aggregated daily counts, such as a
+        column of ChatDB.get_daily_counts, can be provided as daily_counts.
+
         For information on keyword arguments, please see the documentation
         for the calmap library.
         """
@@ -650,7 +682,12 @@ class CalendarHeatmap:
         self._data = data
         
         # Group the data by date and get the frequency for each
-        grouped = self._data['message'].groupby([self._data.index.date]).count()
+        if daily_counts is not None:
+            grouped = daily_counts
+        else:
+            grouped = self._data['message'].groupby(
+                [self._data.index.date]
+            ).count()
 
         # Convert the grouped data into a series
         events = pd.Series(grouped)
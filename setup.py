@@ -28,6 +28,9 @@ setup(
         'pandas', 'matplotlib', 'wordcloud', 'emoji', 'lorem', 'vaderSentiment',
         'calmap',
     ],
+    extras_require={
+        'cache': ['pyarrow'],
+    },
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Intended Audience :: Developers",
@@ -0,0 +1,38 @@
+"""
+Tests the on-disk parse cache of the cache module.
+"""
+
+
+import os
+
+import pandas as pd
+
+from demesstify import cache, parse
+from demesstify.testing import database, messages
+
+
+def test_execution_options_share_a_cache_entry(tmp_path):
+    path = tmp_path / 'export.txt'
+    messages.generate_sample_text(output_path=str(path), total_messages=20)
+    parse_cache = cache.ParseCache(str(tmp_path / 'cache'))
+
+    first = parse.Messages.from_tansee(str(path), cache=parse_cache)
+    second = parse.Messages.from_tansee(
+        str(path), cache=parse_cache, stream=True, chunk_size=5, workers=1,
+    )
+
+    assert len(os.listdir(parse_cache.directory)) == 1
+    pd.testing.assert_frame_equal(second.get_all(), first.get_all())
+
+
+def test_store_and_load_keep_the_index(tmp_path):
+    path = str(tmp_path / 'chat.db')
+    database.generate_sample_database(path, total_messages=50, seed=0)
+    data = parse.iMessageDB(path, by_handle=True, tz='UTC').get()
+    parse_cache = cache.ParseCache(str(tmp_path / 'cache'))
+
+    parse_cache.store('key', data)
+    loaded = parse_cache.load('key')
+
+    assert loaded.index.names == ['handle_id', 'datetime']
+    pd.testing.assert_frame_equal(loaded, data)
@@ -0,0 +1,66 @@
+"""
+Tests the datetime conversions of the clean module.
+"""
+
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from demesstify import clean
+
+
+# Time zones with daylight saving time, one of which shifts by half an hour
+DST_ZONES = ['America/New_York', 'Europe/London', 'Australia/Lord_Howe']
+
+
+@pytest.fixture
+def local_zone(monkeypatch, request):
+    """Sets the local time zone for the duration of a test."""
+
+    monkeypatch.setenv('TZ', request.param)
+    time.tzset()
+    yield request.param
+    monkeypatch.undo()
+    time.tzset()
+
+
+def get_mactimes(zone: str, year: int=2017) -> np.ndarray:
+    """Gets a Mac Absolute Time every 20 minutes around each DST change."""
+
+    # Find the days where the UTC offset of the time zone changes
+    days = pd.date_range(f'{year}-01-01', f'{year}-12-31', freq='D', tz=zone)
+    offsets = np.array([day.utcoffset().total_seconds() for day in days])
+    changes = np.flatnonzero(np.diff(offsets)) + 1
+
+    # Sample the day before, the day of, and the day after each change
+    seconds = []
+    for change in changes:
+        start = days[change - 1].timestamp()
+        seconds.extend(start + np.arange(0, 3 * 86400, 1200))
+    seconds = np.array(seconds, dtype='int64')
+    return (seconds - clean.MAC_EPOCH_OFFSET) * 10**9
+
+
+@pytest.mark.parametrize('local_zone', DST_ZONES, indirect=True)
+def test_bulk_conversion_matches_local_time_across_dst(local_zone):
+    mactimes = get_mactimes(local_zone)
+    assert len(mactimes) > 0
+
+    converted = clean.convert_mactimes_to_datetimes(mactimes)
+    expected = [clean.convert_mactime_to_datetime(date) for date in mactimes]
+    assert converted.tz is None
+    assert converted.to_pydatetime().tolist() == expected
+
+
+@pytest.mark.parametrize('zone', DST_ZONES)
+def test_bulk_conversion_to_time_zone(zone):
+    mactimes = get_mactimes(zone)
+
+    converted = clean.convert_mactimes_to_datetimes(mactimes, tz=zone)
+    seconds = mactimes // 10**9 + clean.MAC_EPOCH_OFFSET
+    expected = pd.to_datetime(seconds, unit='s', utc=True).tz_convert(zone)
+    assert str(converted.tz) == zone
+    assert converted.equals(expected)
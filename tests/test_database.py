@@ -0,0 +1,115 @@
+"""
+Tests the ChatDB object of the database module and how it is shared.
+"""
+
+
+import pickle
+import sqlite3
+
+import pytest
+
+from demesstify import cache, parse
+from demesstify.analysis import attachments
+from demesstify.database import chat
+from demesstify.testing import database
+
+
+@pytest.fixture
+def path(tmp_path) -> str:
+    path = str(tmp_path / 'chat.db')
+    database.generate_sample_database(path, total_messages=200, seed=0)
+    return path
+
+
+@pytest.fixture
+def connections(monkeypatch) -> list:
+    """Records every connection that is opened to a database."""
+
+    opened = []
+    connect = chat.ChatDB._connect
+
+    def record(self):
+        connection = connect(self)
+        opened.append(connection)
+        return connection
+
+    monkeypatch.setattr(chat.ChatDB, '_connect', record)
+    return opened
+
+
+def is_closed(connection: sqlite3.Connection) -> bool:
+    """Determines whether a connection has been closed."""
+
+    try:
+        connection.execute('SELECT 1')
+    except sqlite3.ProgrammingError:
+        return True
+    return False
+
+
+def test_shared_chatdb_reuses_one_connection(path, tmp_path, connections):
+    parse_cache = cache.ParseCache(str(tmp_path / 'cache'))
+    with chat.ChatDB(path) as chatdb:
+        phone = chatdb.read_sql_query('SELECT id FROM handle')['id'].iloc[0]
+        messages = parse.Messages.from_imessage_db(
+            chatdb=chatdb, phone=phone, cache=parse_cache,
+        )
+        messages.update()
+        attachments.Attachments(chatdb=chatdb, phone=phone)
+
+    assert len(messages.get_all()) > 0
+    assert len(connections) == 1
+
+
+def test_messages_reuse_their_own_connection(path, tmp_path, connections):
+    parse_cache = cache.ParseCache(str(tmp_path / 'cache'))
+    messages = parse.Messages.from_imessage_db(path, cache=parse_cache)
+    messages.update()
+    parse.Messages.from_imessage_db(path, cache=parse_cache, lazy=True).trim(
+        '2017-12-01', '2017-12-10',
+    )
+    assert len(connections) == 2
+
+
+def test_chatdb_can_be_pickled(path):
+    with chat.ChatDB(path) as chatdb:
+        expected = chatdb.get_last_rowid()
+        copy = pickle.loads(pickle.dumps(chatdb))
+    with copy:
+        assert copy.get_last_rowid() == expected
+
+
+def test_objects_close_the_connections_they_opened(path, connections):
+    with parse.Messages.from_imessage_db(path) as messages:
+        messages.get_all()
+    with parse.MessagesByHandle(path) as conversations:
+        conversations[1].update()
+    with attachments.Attachments(path) as attachment_data:
+        attachment_data.get_all()
+
+    assert len(connections) == 3
+    assert all(is_closed(connection) for connection in connections)
+
+
+def test_objects_leave_a_shared_chatdb_open(path, connections):
+    with chat.ChatDB(path) as chatdb:
+        with parse.Messages.from_imessage_db(chatdb=chatdb):
+            pass
+        with parse.MessagesByHandle(chatdb=chatdb):
+            pass
+        with attachments.Attachments(chatdb=chatdb):
+            pass
+        assert not is_closed(connections[0])
+    assert is_closed(connections[0])
+
+
+def test_changing_the_attachments_path_closes_the_old_connections(
+        path, tmp_path, connections,
+    ):
+    other = str(tmp_path / 'other.db')
+    database.generate_sample_database(other, total_messages=20, seed=1)
+
+    attachment_data = attachments.Attachments(path)
+    attachment_data.path = other
+    assert is_closed(connections[0])
+    assert attachment_data.chatdb.db_location == other
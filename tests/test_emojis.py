@@ -0,0 +1,99 @@
+"""
+Tests the emoji tokenization and counting of the emojis module.
+"""
+
+
+import pandas as pd
+import pytest
+
+from demesstify.analysis.emojis import Emoji, Emojis, tokenize_emojis
+
+
+FAMILY = '👨\u200d👩\u200d👧\u200d👦'
+THUMBS_UP = '👍'
+MEDIUM_THUMBS_UP = '👍🏽'
+TECHNOLOGIST = '👩🏾\u200d💻'
+RAINBOW_FLAG = '🏳\ufe0f\u200d🌈'
+KEYCAP_ONE = '1\ufe0f\u20e3'
+KEYCAP_HASH = '#\ufe0f\u20e3'
+
+
+@pytest.mark.parametrize('text, expected', [
+    (f'{FAMILY} at the park', [(0, FAMILY)]),
+    (
+        f'{MEDIUM_THUMBS_UP}{THUMBS_UP}',
+        [(0, MEDIUM_THUMBS_UP), (2, THUMBS_UP)],
+    ),
+    (f'Nice {TECHNOLOGIST}!', [(5, TECHNOLOGIST)]),
+    (RAINBOW_FLAG, [(0, RAINBOW_FLAG)]),
+    (f'{KEYCAP_ONE} {KEYCAP_HASH}', [(0, KEYCAP_ONE), (4, KEYCAP_HASH)]),
+    ('🐶\u200d🍕', [(0, '🐶\u200d🍕')]),
+    (f'{THUMBS_UP}\u200d', [(0, THUMBS_UP)]),
+    ('No emojis here', []),
+])
+def test_tokenize_emojis(text, expected):
+    assert tokenize_emojis(text) == expected
+
+
+def get_emoji_data() -> pd.DataFrame:
+    """Gets messages with emojis, including missing and empty messages."""
+
+    messages = [
+        f'Hello {MEDIUM_THUMBS_UP}',
+        None,
+        f'{FAMILY}{FAMILY} {THUMBS_UP}',
+        '',
+        f'{KEYCAP_ONE} {THUMBS_UP}{MEDIUM_THUMBS_UP}',
+        None,
+        f'{TECHNOLOGIST}\n{THUMBS_UP}',
+        f'{KEYCAP_ONE}',
+    ]
+    index = pd.date_range('2017-11-01', periods=len(messages), freq='h')
+    return pd.DataFrame(
+        {'is_sender': [i % 2 == 0 for i in range(8)], 'message': messages},
+        index=pd.DatetimeIndex(index, name='datetime'),
+    )
+
+
+def test_emojis_are_counted_as_whole_graphemes():
+    data = get_emoji_data()
+    emojis = Emojis(data)
+
+    assert emojis.get_counts() == {
+        MEDIUM_THUMBS_UP: 2, FAMILY: 2, THUMBS_UP: 3, KEYCAP_ONE: 2,
+        TECHNOLOGIST: 1,
+    }
+    assert emojis.uniques == [
+        MEDIUM_THUMBS_UP, FAMILY, THUMBS_UP, KEYCAP_ONE, TECHNOLOGIST,
+    ]
+
+
+def test_emoji_messages_skip_missing_messages():
+    data = get_emoji_data()
+    emojis = Emojis(data)
+
+    expected_rows = {
+        MEDIUM_THUMBS_UP: [0, 4], FAMILY: [2], THUMBS_UP: [2, 4, 6],
+        KEYCAP_ONE: [4, 7], TECHNOLOGIST: [6],
+    }
+    for emoji, rows in expected_rows.items():
+        emoji_object = emojis[emoji]
+        pd.testing.assert_frame_equal(
+            emoji_object.get_messages(), data.iloc[rows],
+        )
+
+        # The known count matches counting the messages again
+        recounted = Emoji(emoji, data=emoji_object.get_messages())
+        assert recounted.get_count() == emoji_object.get_count()
+
+
+def test_most_frequent_emojis_break_ties_by_first_appearance():
+    emojis = Emojis(get_emoji_data())
+
+    assert emojis.get_most_frequent(4) == [
+        (THUMBS_UP, 3), (MEDIUM_THUMBS_UP, 2), (FAMILY, 2), (KEYCAP_ONE, 2),
+    ]
+    most_frequent = emojis.get_most_frequent(2, return_objects=True)
+    assert [(emoji.name, count) for emoji, count in most_frequent] == [
+        (THUMBS_UP, 3), (MEDIUM_THUMBS_UP, 2),
+    ]
@@ -0,0 +1,212 @@
+"""
+Tests the parsers and the Messages object of the parse module.
+"""
+
+
+import os
+import random
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from demesstify import cache, clean, parse
+from demesstify.testing import database, messages
+
+
+# Characters other than line feeds that str.splitlines treats as boundaries
+LINE_BOUNDARIES = [
+    '\u2028', '\u2029', '\x0b', '\x0c', '\x1c', '\x1d', '\x1e', '\x85',
+]
+
+
+def write_tansee(path, texts: list[str]):
+    """Writes a Tansee export with a message block for each text."""
+
+    lines = messages.write_header()
+    for i, text in enumerate(texts):
+        direction = 'Send To' if i % 2 == 0 else 'From'
+        header = f'{direction} Jane Doe(15558675309) at Nov {i + 1}, 2017 '
+        lines.extend([f'{header}12:00:00', text, ''])
+    path.write_text(''.join(f'{line}\n' for line in lines), encoding='utf-8')
+
+
+@pytest.mark.parametrize('boundary', LINE_BOUNDARIES)
+def test_tansee_stream_matches_serial_at_line_boundaries(tmp_path, boundary):
+    path = tmp_path / 'export.txt'
+    write_tansee(path, [
+        'Dolore dolor consectetur.',
+        f'Porro neque{boundary}numquam tempora.',
+        f'Magnam modi{boundary}',
+        'Eius quaerat amet consectetur.',
+    ])
+
+    serial = parse.Tansee(str(path)).get()
+    streamed = parse.Tansee(str(path), stream=True, chunk_size=2).get()
+    pd.testing.assert_frame_equal(streamed, serial)
+    assert serial['message'].iloc[1] == 'Porro neque'
+
+
+@pytest.mark.parametrize('texts', [None, []])
+def test_tansee_stream_of_export_without_messages(tmp_path, texts):
+    path = tmp_path / 'export.txt'
+    if texts is None:
+        path.write_text('', encoding='utf-8')
+    else:
+        write_tansee(path, texts)
+
+    serial = parse.Tansee(str(path)).get()
+    streamed = parse.Tansee(str(path), stream=True).get()
+    assert streamed.empty
+    pd.testing.assert_frame_equal(streamed, serial)
+
+
+def test_imessage_csv_stream_matches_serial(tmp_path):
+    path = tmp_path / 'messages.csv'
+    path.write_text(
+        'date,is_from_me,text\n'
+        '533520000,1,Dolore dolor consectetur.\n'
+        '533530000,0,"Porro neque\nnumquam tempora."\n'
+        '533540000,0,Loved “Porro neque”\n'
+        '533550000,1,"Magnam modi\u2028est ipsum."\n',
+        encoding='utf-8',
+    )
+
+    serial = parse.iMessageCSV(str(path)).get()
+    for chunk_size in [1, 2, 100]:
+        streamed = parse.iMessageCSV(
+            str(path), stream=True, chunk_size=chunk_size,
+        ).get()
+        pd.testing.assert_frame_equal(streamed, serial)
+
+
+def test_random_stream_matches_serial():
+    random.seed(0)
+    serial = parse.Random(total_messages=50).get()
+    random.seed(0)
+    streamed = parse.Random(total_messages=50, stream=True, chunk_size=7).get()
+    pd.testing.assert_frame_equal(streamed, serial)
+
+
+def test_messages_by_handle_accepts_messages_options(tmp_path):
+    path = str(tmp_path / 'chat.db')
+    database.generate_sample_database(path, total_messages=200, seed=0)
+    expected = parse.MessagesByHandle(path)
+    parse_cache = cache.ParseCache(str(tmp_path / 'cache'))
+
+    for _ in range(2):
+        conversations = parse.MessagesByHandle(
+            path, cache=parse_cache, compact=True, lazy=True,
+        )
+        assert not conversations.is_loaded
+        assert list(conversations) == list(expected)
+        for handle_id, messages in conversations.items():
+            data = messages.get_all()
+            assert data['reaction'].dtype == parse.Parser._REACTION_DTYPE
+            pd.testing.assert_frame_equal(
+                data, parse.Parser.compact(expected[handle_id].get_all()),
+            )
+    assert len(os.listdir(parse_cache.directory)) == 1
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_update_of_trimmed_messages(tmp_path, lazy):
+    path = str(tmp_path / 'chat.db')
+    database.generate_sample_database(path, total_messages=500, seed=0)
+    parse_cache = cache.ParseCache(str(tmp_path / 'cache'))
+    data = parse.Messages.from_imessage_db(path, cache=parse_cache).get_all()
+    total, day = len(data), data.index[250]
+
+    messages = parse.Messages.from_imessage_db(
+        path, cache=parse_cache, lazy=lazy,
+    )
+    messages.trim(day.strftime('%Y-%m-%d'), day.strftime('%Y-%m-%d'))
+    trimmed = len(messages.get_all())
+
+    # Add a message within the trimmed day and one long after it
+    with sqlite3.connect(path) as connection:
+        connection.executemany(
+            "INSERT INTO message (text, handle_id, date, is_from_me) "
+            "VALUES (?, 1, ?, 0);",
+            [
+                ('Within', clean.convert_datetime_to_mactime(
+                    day.replace(hour=23, minute=59),
+                )),
+                ('After', clean.convert_datetime_to_mactime(
+                    day + pd.Timedelta(days=400),
+                )),
+            ],
+        )
+    connection.close()
+
+    new = messages.update()
+    assert new['message'].tolist() == ['Within']
+    assert len(messages.get_all()) == trimmed + 1
+
+    # The cache still holds every message of the source
+    expected = parse.Messages.from_imessage_db(path).get_all()
+    assert len(expected) == total + 2
+    pd.testing.assert_frame_equal(
+        parse.Messages.from_imessage_db(path, cache=parse_cache).get_all(),
+        expected,
+    )
+
+
+def test_parallel_parsing_matches_serial(tmp_path):
+    text_path = str(tmp_path / 'export.txt')
+    messages.generate_sample_text(output_path=text_path, total_messages=60)
+    db_path = str(tmp_path / 'chat.db')
+    database.generate_sample_database(db_path, total_messages=60, seed=0)
+    csv_path = str(tmp_path / 'messages.csv')
+    parse.iMessageDB(db_path).load().to_csv(csv_path, index=False)
+
+    parsers = [
+        lambda **kwargs: parse.Tansee(text_path, **kwargs),
+        lambda **kwargs: parse.iMessageCSV(csv_path, **kwargs),
+        lambda **kwargs: parse.iMessageDB(db_path, **kwargs),
+    ]
+    for parser in parsers:
+        serial = parser().get()
+        parallel = parser(workers=3).get()
+        pd.testing.assert_frame_equal(parallel, serial)
+
+
+def test_subsets_are_cached_until_the_data_changes():
+    random.seed(0)
+    messages = parse.Messages.from_random(total_messages=200)
+    data = messages.get_all()
+    sent = messages.get_sent()
+
+    assert messages.get_sent() is sent
+    assert messages.get_received() is messages.get_received()
+    assert messages.get(parse.Direction.ALL) is data
+    pd.testing.assert_frame_equal(sent, data[data['is_sender']])
+    expected = data[~data['is_sender'] & data['reaction'].isna()]
+    assert messages.as_string('received') == '\n'.join(expected['message'])
+
+    trimmed = messages.trim('2017-12-01', '2017-12-10')
+    assert messages.get_sent() is not sent
+    pd.testing.assert_frame_equal(
+        messages.get_sent(), trimmed[trimmed['is_sender']],
+    )
+
+
+def test_windows_are_slices_of_the_data():
+    random.seed(0)
+    messages = parse.Messages.from_random(total_messages=200)
+    data = messages.get_all()
+    column = data['is_sender'].to_numpy()
+
+    window = messages.get_window('2017-12-01', '2017-12-10')
+    pd.testing.assert_frame_equal(window, data.loc['2017-12-01':'2017-12-10'])
+    assert np.shares_memory(window['is_sender'].to_numpy(), column)
+
+    periods = list(messages.iter_periods('W'))
+    assert sum(len(window) for _, window in periods) == len(data)
+    for period, window in periods:
+        if len(window) > 0:
+            assert np.shares_memory(window['is_sender'].to_numpy(), column)
+        pd.testing.assert_frame_equal(
+            window, data.loc[period.start_time:period.end_time],
+        )
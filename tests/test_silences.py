@@ -0,0 +1,39 @@
+"""
+Tests the Silences object of the analysis module.
+"""
+
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from demesstify.analysis.silences import Silences
+
+
+@pytest.mark.parametrize('periods', [0, 1])
+def test_silences_of_fewer_than_two_datetimes(periods):
+    silences = Silences(pd.date_range('2017-11-01', periods=periods))
+
+    assert silences.get_longest() is pd.NaT
+    assert silences.get_datetime_of_longest() is None
+    assert silences.get_top().empty
+    assert silences.get_histogram(['0s', '1h', '1D']).tolist() == [0, 0]
+    percentiles = silences.get_percentiles()
+    assert percentiles.isna().all()
+    assert percentiles.index.tolist() == [25, 50, 75, 90, 99]
+
+
+def test_top_silences_take_the_earliest_ties_at_the_boundary():
+    rng = np.random.default_rng(0)
+    gaps = rng.integers(1, 4, size=200)
+    index = pd.to_datetime('2017-11-01') + pd.to_timedelta(
+        np.concatenate(([0], np.cumsum(gaps))), unit='h',
+    )
+
+    for k in [0, 1, 5, 50, 150, 300]:
+        expected = np.argsort(-gaps, kind='stable')[:k]
+        top = Silences(index).get_top(k)
+        assert top['silence'].dt.components['hours'].tolist() == (
+            gaps[expected].tolist()
+        )
+        assert top.index.equals(index[expected + 1])
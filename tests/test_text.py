@@ -0,0 +1,148 @@
+"""
+Tests the Text object of the analysis module.
+"""
+
+
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from demesstify import parse
+from demesstify.analysis.text import Text, encode_runs
+
+
+def test_per_day_calculations_of_empty_data():
+    random.seed(0)
+    messages = parse.Messages.from_random(total_messages=50)
+    messages.trim('1990-01-01', '1990-01-02')
+    text = Text(messages.get_all())
+
+    assert text.get_daily_counts().empty
+    assert np.isnan(text.get_least_per_day())
+    assert np.isnan(text.get_most_per_day())
+    assert np.isnan(text.get_average_per_day())
+    assert text.get_count_of_days_with_messages() == 0
+    assert text.get_count_of_days_without_messages() == 0
+    assert text.get_longest_streak() == 0
+    assert text.get_longest_silence() is pd.NaT
+    assert text.get_datetime_of_longest_silence() is None
+
+
+def test_per_day_calculations_of_empty_daily_counts():
+    text = Text(daily_counts=pd.Series([], dtype='int64'))
+
+    assert text.get_daily_counts().empty
+    assert np.isnan(text.get_most_per_day())
+
+
+def test_top_runs_take_the_earliest_ties_at_the_boundary():
+    rng = np.random.default_rng(0)
+    lengths = rng.integers(1, 4, size=200)
+    directions = np.arange(len(lengths)) % 2 == 0
+    data = pd.DataFrame(
+        {'is_sender': np.repeat(directions, lengths)},
+        index=pd.date_range('2017-11-01', periods=lengths.sum(), freq='min'),
+    )
+    starts, _ = encode_runs(data['is_sender'].to_numpy())
+
+    for k in [0, 1, 5, 50, 150, 300]:
+        expected = np.argsort(-lengths, kind='stable')[:k]
+        top = Text(data).get_top_runs(k)
+        assert top['length'].tolist() == lengths[expected].tolist()
+        assert top.index.equals(data.index[starts[expected]])
+
+
+# Messages with overlapping, nested, and differently cased occurrences
+SUBSTRING_MESSAGES = [
+    'aaaa', 'ushers she hers', 'His hiss, HIS hers', None, 'abababa',
+    'Straße STRASSE', 'she sells sea shells', '', 'ahishers aaa',
+]
+SUBSTRINGS = [
+    'aa', 'aaa', 'a', 'he', 'she', 'his', 'hers', 'aba', 'bab', 'ss',
+    'straße', 'sea shells', 'zzz', 'aa',
+]
+
+
+def get_substring_data() -> pd.DataFrame:
+    """Gets messages spread over a few days in both directions."""
+
+    index = pd.date_range('2017-11-01 20:00', periods=9, freq='7h')
+    return pd.DataFrame(
+        {
+            'is_sender': [i % 3 == 0 for i in range(9)],
+            'message': SUBSTRING_MESSAGES,
+        },
+        index=pd.DatetimeIndex(index, name='datetime'),
+    )
+
+
+def count_with_str_count(
+        data: pd.DataFrame, ignore_case: bool=False,
+    ) -> pd.DataFrame:
+    """Counts each substring in each message with str.count."""
+
+    normalize = str.casefold if ignore_case else (lambda text: text)
+    rows = []
+    for datetime, row in data.iterrows():
+        if not isinstance(row['message'], str):
+            continue
+        message = normalize(row['message'])
+        for term in dict.fromkeys(SUBSTRINGS):
+            rows.append({
+                'is_sender': row['is_sender'],
+                'date': datetime.normalize(),
+                'term': term,
+                'count': message.count(normalize(term)),
+            })
+    return pd.DataFrame(rows)
+
+
+@pytest.mark.parametrize('ignore_case', [False, True])
+def test_counts_of_substrings_match_str_count(ignore_case):
+    data = get_substring_data()
+    expected = count_with_str_count(data, ignore_case=ignore_case)
+    totals = expected.groupby('term', sort=False)['count'].sum()
+
+    counts = Text(data).get_counts_of_substrings(
+        SUBSTRINGS, ignore_case=ignore_case,
+    )
+    assert counts['term'].tolist() == list(dict.fromkeys(SUBSTRINGS))
+    assert counts['count'].tolist() == totals.tolist()
+    if not ignore_case:
+        assert counts['count'].tolist() == [
+            Text(data).get_count_of_substring(term) for term in counts['term']
+        ]
+
+
+@pytest.mark.parametrize('by, column', [
+    ('direction', 'is_sender'), ('day', 'date'),
+])
+@pytest.mark.parametrize('ignore_case', [False, True])
+def test_counts_of_substrings_by_breakdown(by, column, ignore_case):
+    data = get_substring_data()
+    expected = count_with_str_count(data, ignore_case=ignore_case)
+    terms = list(dict.fromkeys(SUBSTRINGS))
+    expected = expected[expected['count'] > 0].assign(
+        term=lambda df: df['term'].map(terms.index),
+    )
+    expected = expected.groupby([column, 'term'])['count'].sum().reset_index()
+    expected['term'] = [terms[term] for term in expected['term']]
+
+    counts = Text(data).get_counts_of_substrings(
+        SUBSTRINGS, by=by, ignore_case=ignore_case,
+    )
+    assert counts.columns.tolist() == [column, 'term', 'count']
+    pd.testing.assert_frame_equal(counts, expected, check_dtype=False)
+
+
+def test_counts_of_substrings_reject_invalid_arguments():
+    text = Text(get_substring_data())
+
+    with pytest.raises(ValueError):
+        text.get_counts_of_substrings(SUBSTRINGS, by='week')
+    with pytest.raises(ValueError):
+        text.get_counts_of_substrings([])
+    with pytest.raises(ValueError):
+        text.get_counts_of_substrings(['he', ''])